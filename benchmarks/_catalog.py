@@ -0,0 +1,83 @@
+"""
+Synthetic BCRP-like metadata catalog shared by the benchmark scripts.
+
+The real catalog is a ~17MB download; the benchmarks build a deterministic
+stand-in with the same columns and similar Spanish series names so they can
+run offline.
+"""
+import random
+
+import pandas as pd
+
+SUBJECTS = [
+    "Tipo de cambio - TC Interbancario (S/ por US$)",
+    "Índice de precios Lima Metropolitana (índice 2009 = 100)",
+    "Producto bruto interno y demanda interna (variaciones porcentuales)",
+    "Crédito al sector privado de las sociedades de depósito",
+    "Reservas internacionales netas (millones US$)",
+    "Tasas de interés activas en moneda nacional",
+    "Tasas de interés pasivas en moneda extranjera",
+    "Cotizaciones internacionales - Cobre - LME (cUS$ por libras)",
+    "Cotizaciones internacionales - Oro - LME (US$ por onzas troy)",
+    "Balanza comercial - Exportaciones FOB",
+    "Expectativas empresariales sobre la economía a 12 meses",
+    "Liquidez de las sociedades creadoras de depósito",
+]
+QUALIFIERS = [
+    "Compra", "Venta", "Promedio", "Fin de periodo", "Corto plazo",
+    "Largo plazo", "Soles", "Dólares", "Var. % mensual", "Var. % 12 meses",
+    "Minería", "Manufactura", "Construcción", "Comercio", "Servicios",
+]
+# Long tail of topics so that, as in the real catalog, most series share
+# no token with a given query.
+TOPICS = [
+    "arroz", "azúcar", "café", "cacao", "espárragos", "uvas", "paltas",
+    "harina de pescado", "aceite de pescado", "zinc", "plomo", "estaño",
+    "hierro", "molibdeno", "plata", "petróleo", "gas natural", "textiles",
+    "confecciones", "químicos", "siderometalurgia", "papeles", "cemento",
+    "electricidad", "agua", "telecomunicaciones", "transporte", "turismo",
+    "pesca", "agropecuario", "hidrocarburos", "bancos", "financieras",
+    "cajas municipales", "cajas rurales", "edpymes", "AFP", "seguros",
+    "bonos soberanos", "certificados de depósito", "letras del tesoro",
+    "gobierno general", "empresas públicas", "gobiernos regionales",
+    "importaciones de bienes de capital", "insumos", "bienes de consumo",
+]
+REGIONS = ["Lima", "Arequipa", "Cusco", "Piura", "Loreto", "Junín", "Puno"]
+FREQUENCIES = ["Diaria", "Mensual", "Trimestral", "Anual"]
+
+
+def make_catalog(n_series: int = 20000, seed: int = 7) -> pd.DataFrame:
+    """Return a synthetic catalog with ``n_series`` rows."""
+    rng = random.Random(seed)
+    codes, names, freqs = [], [], []
+    for i in range(n_series):
+        freq = rng.choice(FREQUENCIES)
+        if rng.random() < 0.5:
+            parts = [rng.choice(SUBJECTS)]
+        else:
+            parts = [f"Indicadores de {rng.choice(TOPICS)}"]
+        parts += rng.sample(QUALIFIERS, rng.randint(0, 2))
+        if rng.random() < 0.3:
+            parts.append(rng.choice(REGIONS))
+        codes.append(f"PN{i:05d}{freq[0]}M")
+        names.append(" - ".join(parts))
+        freqs.append(freq)
+    return pd.DataFrame({
+        "Código de serie": codes,
+        "Nombre de serie": names,
+        "Frecuencia": freqs,
+    })
+
+
+QUERIES = [
+    "tipo de cambio venta",
+    "tc compra",
+    "inflacion lima",
+    "precio del cobre",
+    "reservas internacionales netas",
+    "tasa de interes activa soles",
+    "credito sector privado",
+    "pbi mineria",
+    "expectativas empresariales",
+    "oro internacional",
+]
@@ -0,0 +1,56 @@
+"""
+Benchmark: get_table on a large daily range, with and without the JSON
+round trip between the data layer and the tool.
+
+The previous ``get_table`` serialized the fetched frame with ``to_json``,
+parsed it back with ``pd.read_json`` and serialized it again for the MCP
+response. It now renames the ``DataResult`` frame and serializes once.
+
+Run with:
+    python benchmarks/bench_data_layer.py [n_periods]
+"""
+import io
+import sys
+import time
+
+import pandas as pd
+
+from mcp_bcrp.client import _parse_periods
+
+from bench_parse import CODES, make_payload
+
+NAMES = {code: f"Serie {i}" for i, code in enumerate(CODES)}
+
+
+def round_trip(df: pd.DataFrame) -> str:
+    data_json = df.to_json(orient="records", date_format="iso")
+    df = pd.read_json(io.StringIO(data_json), orient="records")
+    return df.rename(columns=NAMES).to_json(orient="records", date_format="iso", indent=2)
+
+
+def direct(df: pd.DataFrame) -> str:
+    return df.rename(columns=NAMES).to_json(orient="records", date_format="iso", indent=2)
+
+
+def best_of(fn, repeat: int = 5) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main() -> None:
+    n_periods = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    df = _parse_periods(make_payload(n_periods), CODES)
+
+    before = best_of(lambda: round_trip(df))
+    after = best_of(lambda: direct(df))
+    print(f"get_table, {n_periods} daily periods x {len(CODES)} series")
+    print(f"  JSON round trip: {before * 1000:8.1f} ms")
+    print(f"  DataResult:      {after * 1000:8.1f} ms  ({before / after:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Benchmark: cold-start import cost of the MCP server entry point.
+
+Runs ``python -X importtime -c "import mcp_bcrp.server"`` in a fresh
+interpreter and reports the total import time, the slowest top-level
+imports and whether any of the heavy data dependencies (which should only
+load on first tool use) were pulled in.
+
+Run with:
+    python benchmarks/bench_import.py [module]
+"""
+import subprocess
+import sys
+
+HEAVY = ("pandas", "numpy", "rapidfuzz", "matplotlib", "pyarrow")
+
+
+def import_times(module: str) -> dict:
+    """Map module name -> (self, cumulative) import time in microseconds."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        if not self_us.strip().isdigit():
+            continue  # header row
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def main() -> None:
+    module = sys.argv[1] if len(sys.argv) > 1 else "mcp_bcrp.server"
+    times = import_times(module)
+    top_level = {name: t for name, t in times.items() if "." not in name}
+
+    print(f"import {module}: {times[module][1] / 1000:.1f} ms cumulative")
+    print(f"{'module':<28}{'cumulative':>12}")
+    for name, (_, cumulative) in sorted(top_level.items(), key=lambda kv: -kv[1][1])[:10]:
+        print(f"{name:<28}{cumulative / 1000:>9.1f} ms")
+    loaded = [name for name in HEAVY if name in times]
+    print(f"heavy dependencies imported: {', '.join(loaded) or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Benchmark: inverted token index shortlist versus full-corpus scoring.
+
+Reports per-query latency with and without the index and checks that both
+modes resolve every benchmark query to the same result.
+
+Run with:
+    python benchmarks/bench_index.py [n_series]
+"""
+import sys
+import time
+
+from mcp_bcrp.search_engine import SearchEngine
+
+from _catalog import QUERIES, make_catalog
+
+EXTRA_QUERIES = [
+    "exportaciones mineria",
+    "harina de pescado",
+    "cajas municipales",
+    "bonos soberanos",
+    "inflacon",  # misspelled: empty shortlist, full-scan fallback
+]
+
+
+def main(n_series: int = 20000) -> None:
+    df = make_catalog(n_series)
+    queries = QUERIES + EXTRA_QUERIES
+    full_scan = SearchEngine(df, use_index=False)
+    indexed = SearchEngine(df)
+
+    timings = {}
+    for label, engine in (("full scan", full_scan), ("indexed", indexed)):
+        start = time.perf_counter()
+        for query in queries:
+            engine.solve(query)
+        timings[label] = (time.perf_counter() - start) / len(queries)
+
+    same = sum(full_scan.solve(q) == indexed.solve(q) for q in queries)
+    sizes = [indexed._shortlist(indexed._normalize(q)) for q in queries]
+    mean_size = sum(len(s) if s is not None else n_series for s in sizes) / len(sizes)
+
+    print(f"catalog size:         {n_series} series")
+    print(f"mean candidates:      {mean_size:9.0f}")
+    print(f"full scan:            {timings['full scan'] * 1000:9.1f} ms/query")
+    print(f"indexed:              {timings['indexed'] * 1000:9.1f} ms/query")
+    print(f"identical results:    {same}/{len(queries)}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
@@ -0,0 +1,49 @@
+"""
+Benchmark: JSON decode/encode time per available backend.
+
+Covers the payloads the package handles: an API series response, the
+metadata cache (records) and a batch of search results. Install orjson or
+msgspec (``pip install "mcp-bcrp[fast]"``) to compare against the stdlib.
+
+Run with:
+    python benchmarks/bench_json.py
+"""
+import json
+import time
+
+from mcp_bcrp.fast_json import BACKEND, BACKENDS
+
+from _catalog import make_catalog
+from bench_parse import make_payload
+
+
+def best_of(fn, repeat: int = 5) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main() -> None:
+    api = json.dumps({"periods": make_payload(20000)}).encode("utf-8")
+    metadata = make_catalog(20000).to_json(orient="records", force_ascii=False).encode("utf-8")
+    results = [
+        {"codigo_serie": f"PN{i:05d}PM", "confidence": 0.97, "name": "Índice de precios Lima"}
+        for i in range(500)
+    ]
+
+    print(f"default backend: {BACKEND}")
+    print(f"{'backend':<10}{'api decode':>14}{'metadata decode':>18}{'results encode':>17}")
+    for name, (loads, dumps) in BACKENDS.items():
+        print(
+            f"{name:<10}"
+            f"{best_of(lambda: loads(api)) * 1000:>11.1f} ms"
+            f"{best_of(lambda: loads(metadata)) * 1000:>15.1f} ms"
+            f"{best_of(lambda: dumps(results)) * 1000:>14.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Benchmark: resident memory per worker process holding the metadata catalog.
+
+Starts several worker processes that each run ``BCRPMetadata.load()`` on the
+same on-disk catalog, either the JSON records cache or the memory-mapped
+Feather cache, build the search engine as the first search does and report
+per-worker memory once all workers are alive:
+
+    anon  private memory (the catalog copy each worker owns)
+    file  file-backed resident pages (shared via the OS page cache)
+    pss   proportional set size: shared pages split across the workers
+
+Linux only (reads ``/proc/self/smaps_rollup``); needs pyarrow.
+
+Run with:
+    python benchmarks/bench_mmap.py [workers]
+"""
+import multiprocessing as mp
+import sys
+import tempfile
+from pathlib import Path
+
+from _catalog import make_catalog
+
+ROWS = 200_000
+
+
+def memory_kb() -> dict:
+    fields = {"Rss": "rss", "Pss": "pss", "Anonymous": "anon"}
+    usage = {}
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            key, _, value = line.partition(":")
+            if key in fields:
+                usage[fields[key]] = int(value.split()[0])
+    usage["file"] = usage["rss"] - usage["anon"]
+    return usage
+
+
+def worker(mode: str, cache: str, barrier, results) -> None:
+    import asyncio
+    import os
+
+    os.environ["BCRP_CACHE_DIR"] = cache
+    os.environ["BCRP_METADATA_MAX_AGE"] = "0"
+    from mcp_bcrp import client
+    if mode == "json":
+        # As on an install without pyarrow: read JSON, no Feather migration.
+        client._pyarrow_available = lambda: False
+
+    before = memory_kb()
+    metadata = client.BCRPMetadata()
+    asyncio.run(metadata.load())
+    engine = metadata._get_engine()
+    barrier.wait()
+    after = memory_kb()
+    barrier.wait()
+    results.put({key: after[key] - before[key] for key in after} | {"rows": len(engine.search_corpus)})
+
+
+def run(mode: str, path: Path, workers: int) -> dict:
+    ctx = mp.get_context("spawn")
+    barrier = ctx.Barrier(workers)
+    results = ctx.Queue()
+    procs = [ctx.Process(target=worker, args=(mode, str(path), barrier, results)) for _ in range(workers)]
+    for proc in procs:
+        proc.start()
+    rows = [results.get() for _ in procs]
+    for proc in procs:
+        proc.join()
+    return {key: sum(row[key] for row in rows) / workers for key in ("anon", "file", "pss")}
+
+
+def main() -> None:
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    catalog = make_catalog(ROWS)
+    with tempfile.TemporaryDirectory() as tmp:
+        json_dir = Path(tmp) / "json"
+        feather_dir = Path(tmp) / "feather"
+        json_dir.mkdir()
+        feather_dir.mkdir()
+        catalog.to_json(json_dir / "bcrp_metadata.json", orient="records", force_ascii=False)
+        catalog.to_feather(feather_dir / "bcrp_metadata.feather", compression="uncompressed")
+
+        print(f"{ROWS} series, {workers} workers (MB per worker, after load + search engine)")
+        print(f"{'cache':<10}{'anon':>10}{'file':>10}{'pss':>10}")
+        for mode, path in (("json", json_dir), ("feather", feather_dir)):
+            usage = run(mode, path, workers)
+            print(f"{mode:<10}" + "".join(f"{usage[key] / 1024:>10.1f}" for key in ("anon", "file", "pss")))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Benchmark: parsing an API ``periods`` payload into a DataFrame.
+
+Compares the columnar ``_parse_periods`` against the previous loop that
+built a dict per period and called ``float()`` on each cell.
+
+Run with:
+    python benchmarks/bench_parse.py [n_periods]
+"""
+import random
+import sys
+import time
+
+import pandas as pd
+
+from mcp_bcrp.client import _parse_periods
+
+CODES = ["PD04637PD", "PD04638PD", "PD04639PD"]
+
+
+def make_payload(n_periods: int = 20000, seed: int = 7) -> list:
+    """Synthetic daily payload with ~2% missing markers."""
+    rng = random.Random(seed)
+    return [
+        {
+            "name": f"{i % 28 + 1:02d}.Ene.{i // 365 % 100:02d}",
+            "values": [
+                "n.d." if rng.random() < 0.02 else f"{rng.uniform(2.5, 4.0):.4f}"
+                for _ in CODES
+            ],
+        }
+        for i in range(n_periods)
+    ]
+
+
+def rowwise_parse(periods: list, codes: list) -> pd.DataFrame:
+    """Reference implementation: the original per-cell loop."""
+    records = []
+    for p in periods:
+        row = {"time": p["name"]}
+        for i, val in enumerate(p["values"]):
+            col_name = codes[i] if i < len(codes) else f"series_{i}"
+            try:
+                if isinstance(val, str) and "nir" in val.lower():
+                    row[col_name] = None
+                elif val == "n.d.":
+                    row[col_name] = None
+                else:
+                    row[col_name] = float(val)
+            except (ValueError, TypeError):
+                row[col_name] = None
+        records.append(row)
+    return pd.DataFrame(records)
+
+
+def main(n_periods: int = 20000) -> None:
+    periods = make_payload(n_periods)
+
+    start = time.perf_counter()
+    expected = rowwise_parse(periods, CODES)
+    rowwise = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = _parse_periods(periods, CODES)
+    columnar = time.perf_counter() - start
+
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+    print(f"payload:   {n_periods} periods x {len(CODES)} series")
+    print(f"row-wise:  {rowwise * 1000:9.1f} ms")
+    print(f"columnar:  {columnar * 1000:9.1f} ms  ({rowwise / columnar:.1f}x)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
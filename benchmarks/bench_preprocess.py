@@ -0,0 +1,53 @@
+"""
+Benchmark: SearchEngine corpus preprocessing (cold start).
+
+Compares the column-oriented ``_preprocess_metadata`` against the previous
+row-wise ``df.iterrows()`` loop that normalized one series at a time.
+
+Run with:
+    python benchmarks/bench_preprocess.py [n_series]
+"""
+import sys
+import time
+
+from mcp_bcrp.search_engine import SearchEngine
+
+from _catalog import make_catalog
+
+
+def rowwise_corpus(engine: SearchEngine) -> list:
+    """Reference implementation: the original per-row preprocessing loop."""
+    processed = []
+    for idx, row in engine.df.iterrows():
+        name_norm = engine._normalize(str(row.get('Nombre de serie', '')))
+        attrs = engine._extract_attributes(name_norm)
+        processed.append({
+            "idx": idx,
+            "codigo_serie": row.get("Código de serie"),
+            "name_norm": name_norm,
+            "tokens": set(name_norm.split()),
+            "currency": attrs['currency'],
+            "side": attrs['side'],
+            "horizon": attrs['horizon'],
+        })
+    return processed
+
+
+def main(n_series: int = 20000) -> None:
+    df = make_catalog(n_series)
+
+    start = time.perf_counter()
+    engine = SearchEngine(df)
+    vectorized = time.perf_counter() - start
+
+    start = time.perf_counter()
+    rowwise_corpus(engine)
+    rowwise = time.perf_counter() - start
+
+    print(f"catalog size: {n_series} series")
+    print(f"row-wise:     {rowwise * 1000:9.1f} ms")
+    print(f"vectorized:   {vectorized * 1000:9.1f} ms  ({rowwise / vectorized:.1f}x)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
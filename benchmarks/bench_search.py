@@ -0,0 +1,68 @@
+"""
+Benchmark: per-query latency of BCRPMetadata.solve().
+
+Compares a cold query (SearchEngine built from the whole catalog, as every
+call used to do) against warm queries served by the cached engine, and the
+batched ``process.cdist`` scoring against a per-entry ``token_set_ratio``
+loop, and ``solve_many()`` against one ``solve()`` call per query.
+
+Run with:
+    python benchmarks/bench_search.py [n_series]
+"""
+import sys
+import time
+
+from rapidfuzz import fuzz
+
+from mcp_bcrp.client import BCRPMetadata
+
+from _catalog import QUERIES, make_catalog
+
+
+def main(n_series: int = 20000) -> None:
+    metadata = BCRPMetadata()
+    metadata.df = make_catalog(n_series)
+    metadata._loaded = True
+
+    start = time.perf_counter()
+    metadata.solve(QUERIES[0])
+    cold = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for query in QUERIES:
+        metadata.solve(query)
+    warm = (time.perf_counter() - start) / len(QUERIES)
+
+    engine = metadata._get_engine()
+    q_norms = [engine._normalize(q) for q in QUERIES]
+    start = time.perf_counter()
+    for q_norm in q_norms:
+        [fuzz.token_set_ratio(q_norm, name) for name in engine._names_norm]
+    loop = (time.perf_counter() - start) / len(QUERIES)
+
+    start = time.perf_counter()
+    for q_norm in q_norms:
+        engine._score([q_norm], [engine._extract_attributes(q_norm)])
+    batched = (time.perf_counter() - start) / len(QUERIES)
+
+    batch_queries = QUERIES * 20
+    start = time.perf_counter()
+    for query in batch_queries:
+        metadata.solve(query)
+    one_by_one = time.perf_counter() - start
+
+    start = time.perf_counter()
+    metadata.solve_many(batch_queries)
+    many = time.perf_counter() - start
+
+    print(f"catalog size:              {n_series} series")
+    print(f"cold solve (build + score): {cold * 1000:9.1f} ms")
+    print(f"warm solve (score only):    {warm * 1000:9.1f} ms/query")
+    print(f"scoring, per-entry loop:    {loop * 1000:9.1f} ms/query")
+    print(f"scoring, process.cdist:     {batched * 1000:9.1f} ms/query")
+    print(f"{len(batch_queries)} queries ({len(QUERIES)} distinct), solve() each: {one_by_one * 1000:9.1f} ms")
+    print(f"{len(batch_queries)} queries ({len(QUERIES)} distinct), solve_many(): {many * 1000:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
@@ -17,6 +17,13 @@ except (ImportError, AttributeError):
     __version__ = "0+unknown"
 __author__ = "Maykol Medrano"
 
-from mcp_bcrp.client import AsyncBCRPClient, BCRPMetadata
+__all__ = ["AsyncBCRPClient", "BCRPMetadata", "parse_period_labels", "__version__"]
 
-__all__ = ["AsyncBCRPClient", "BCRPMetadata", "__version__"]
+
+def __getattr__(name):
+    # Import the client (httpx, JSON backend) only when its names are used,
+    # so ``import mcp_bcrp`` stays cheap.
+    if name in ("AsyncBCRPClient", "BCRPMetadata", "parse_period_labels"):
+        from mcp_bcrp import client
+        return getattr(client, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,135 @@
+"""
+On-disk cache for fetched series observations.
+
+Entries are keyed by series code, frequency and requested period, and live
+next to the metadata cache (see ``cache_dir()``). Each entry is a small JSON
+file holding the period labels, the values and the time it was fetched;
+entries expire after a per-frequency TTL, so daily series are refetched
+sooner than annual ones.
+"""
+
+import logging
+import os
+import re
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from mcp_bcrp import fast_json
+
+logger = logging.getLogger("mcp_bcrp")
+
+
+def cache_dir() -> Path:
+    """Determine the best cache directory for mcp_bcrp files."""
+    # Priority 1: Environment variable
+    if env_dir := os.environ.get("BCRP_CACHE_DIR"):
+        path = Path(env_dir)
+        path.mkdir(parents=True, exist_ok=True)
+        return path
+
+    # Priority 2: User cache directory
+    if os.name == 'nt':  # Windows
+        base = Path(os.environ.get("LOCALAPPDATA", Path.home() / "AppData" / "Local"))
+    else:  # Unix
+        base = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache"))
+
+    path = base / "mcp_bcrp"
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+class SeriesCache:
+    """
+    Per-series observation cache.
+
+    Args:
+        directory: Where entries are stored. Defaults to ``cache_dir()/series``.
+        ttl: Seconds an entry stays fresh, per frequency. Defaults to ``TTL``.
+        clock: Wall-clock time source in seconds (injectable for tests).
+    """
+
+    # Fresh data lands daily for daily series but only once a year for
+    # annual ones.
+    TTL = {
+        "daily": 6 * 3600,
+        "monthly": 24 * 3600,
+        "quarterly": 7 * 24 * 3600,
+        "annual": 30 * 24 * 3600,
+    }
+
+    def __init__(
+        self,
+        directory: Optional[Path] = None,
+        ttl: Optional[Dict[str, float]] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.directory = Path(directory) if directory is not None else cache_dir() / "series"
+        self.ttl = {**self.TTL, **(ttl or {})}
+        self._clock = clock
+
+    def _path(self, code: str, frequency: str, start: Optional[str], end: Optional[str]) -> Path:
+        name = f"{code}.{frequency}.{start or 'all'}.{end or 'all'}.json"
+        return self.directory / re.sub(r"[^\w.-]", "_", name)
+
+    def load(
+        self, code: str, frequency: str, start: Optional[str], end: Optional[str]
+    ) -> Optional[Dict[str, Any]]:
+        """Return the stored entry regardless of age, or ``None``."""
+        path = self._path(code, frequency, start, end)
+        try:
+            return fast_json.loads(path.read_bytes())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable series cache {path}: {e}")
+            return None
+
+    def is_fresh(self, entry: Dict[str, Any], frequency: str) -> bool:
+        """Whether ``entry`` is younger than the TTL of ``frequency``."""
+        ttl = self.ttl.get(frequency, self.ttl["monthly"])
+        return self._clock() - entry.get("fetched_at", 0) < ttl
+
+    def get(
+        self, code: str, frequency: str, start: Optional[str], end: Optional[str]
+    ) -> Optional[Dict[str, Any]]:
+        """Return the stored entry if it is still fresh, else ``None``."""
+        entry = self.load(code, frequency, start, end)
+        if entry is None or not self.is_fresh(entry, frequency):
+            return None
+        return entry
+
+    def put(
+        self,
+        code: str,
+        frequency: str,
+        start: Optional[str],
+        end: Optional[str],
+        times: List[str],
+        values: List[Optional[float]],
+    ):
+        """Store observations for one series, replacing any previous entry."""
+        entry = {
+            "code": code,
+            "frequency": frequency,
+            "start": start,
+            "end": end,
+            "fetched_at": self._clock(),
+            "time": list(times),
+            "values": list(values),
+        }
+        path = self._path(code, frequency, start, end)
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            # Write to a temp file and rename so readers never see a partial entry.
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    f.write(fast_json.dumps(entry))
+                os.replace(tmp, path)
+            except BaseException:
+                os.unlink(tmp)
+                raise
+        except OSError as e:
+            logger.warning(f"Failed to write series cache {path}: {e}")
@@ -1,110 +1,710 @@
 import logging
-from typing import List, Dict, Any, TYPE_CHECKING
+from typing import List, Dict, Any, BinaryIO, Callable, TYPE_CHECKING
 import asyncio
-import io
+import datetime
+import itertools
 import os
+import time
 from pathlib import Path
 import httpx
 
+from mcp_bcrp import fast_json
+from mcp_bcrp.cache import SeriesCache, cache_dir
+from mcp_bcrp.rate_limit import TokenBucket
+
 if TYPE_CHECKING:
+    import numpy as np
     import pandas as pd
 
 logger = logging.getLogger("mcp_bcrp")
 
 
-def _timeout_from_env(default: float = 120.0) -> float:
-    """Return a positive HTTP timeout from ``BCRP_TIMEOUT`` if configured."""
-    raw = os.environ.get("BCRP_TIMEOUT")
+def _number_from_env(name: str, default, cast=float, allow_zero: bool = False):
+    """Return a positive number from environment variable ``name`` if configured."""
+    raw = os.environ.get(name)
     if raw is None or not raw.strip():
         return default
     try:
-        value = float(raw)
+        value = cast(raw)
     except ValueError:
-        logger.warning("Invalid BCRP_TIMEOUT=%r; using %.1f seconds", raw, default)
+        logger.warning("Invalid %s=%r; using %s", name, raw, default)
         return default
-    if value <= 0:
-        logger.warning("BCRP_TIMEOUT must be positive; using %.1f seconds", default)
+    if value < 0 or (value == 0 and not allow_zero):
+        logger.warning("%s must be %s; using %s", name,
+                       "non-negative" if allow_zero else "positive", default)
         return default
     return value
 
 
+def _timeout_from_env(default: float = 120.0) -> float:
+    """Return a positive HTTP timeout from ``BCRP_TIMEOUT`` if configured."""
+    return _number_from_env("BCRP_TIMEOUT", default)
+
+
+SPANISH_MONTHS = {
+    'Ene': 1, 'Feb': 2, 'Mar': 3, 'Abr': 4, 'May': 5, 'Jun': 6,
+    'Jul': 7, 'Ago': 8, 'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dic': 12,
+}
+
+
+# Daily "02.Ene.24", monthly "Ene.2024", quarterly "T1.24", annual "2024".
+_PERIOD_LABEL = (
+    r"^(?:(?P<day>\d+)\.)?(?P<month>[A-Z][a-z]{2})\.(?P<year>\d+)$"
+    r"|^T(?P<quarter>\d)\.(?P<qyear>\d+)$"
+    r"|^(?P<ayear>\d+)$"
+)
+
+# pandas Period frequency of each label shape.
+PERIOD_FREQ = {"daily": "D", "monthly": "M", "quarterly": "Q", "annual": "Y"}
+
+
+def parse_period_labels(labels, as_period: bool = False) -> "pd.Index":
+    """
+    Convert BCRP period labels to dates in one vectorized pass.
+
+    Handles daily ``02.Ene.24``, monthly ``Ene.2024``, quarterly ``T1.24``
+    and annual ``2024`` labels, and maps Spanish month abbreviations through
+    a categorical lookup instead of per-value string replacement. This is
+    the only parser of period labels; merging, sorting and the series
+    cache all go through it.
+
+    Args:
+        labels: Iterable of labels, e.g. a DataFrame's 'time' column.
+        as_period: Return a ``PeriodIndex`` at the labels' frequency
+            instead of the ``DatetimeIndex`` of period starts. All labels
+            must then share one frequency.
+
+    Returns:
+        ``DatetimeIndex`` with the first day of each period (``NaT`` for
+        unrecognized labels), or a ``PeriodIndex`` if ``as_period``.
+
+    Raises:
+        ValueError: With ``as_period``, if labels are unrecognized or mix
+            frequencies.
+    """
+    import numpy as np
+    import pandas as pd
+
+    labels = pd.Series(list(labels), dtype=object).astype(str).str.strip()
+    parts = labels.str.extract(_PERIOD_LABEL)
+
+    abbrev = parts["month"].where(parts["month"].isin(list(SPANISH_MONTHS)))
+    month = pd.Categorical(abbrev, categories=list(SPANISH_MONTHS)).codes + 1
+    quarter = pd.to_numeric(parts["quarter"]).to_numpy()
+    month = np.where(month > 0, month, np.where(quarter >= 1, 3 * quarter - 2, np.nan))
+    month = np.where(parts["ayear"].notna(), 1, month)
+
+    year_text = parts["year"].fillna(parts["qyear"]).fillna(parts["ayear"])
+    year = pd.to_numeric(year_text).to_numpy()
+    # Two-digit years follow the strptime ``%y`` pivot (69-99 -> 1900s).
+    short = year_text.str.len().to_numpy() == 2
+    year = np.where(short, year + np.where(year >= 69, 1900, 2000), year)
+    day = pd.to_numeric(parts["day"]).fillna(1).to_numpy()
+
+    dates = pd.DatetimeIndex(pd.to_datetime(
+        pd.DataFrame({"year": year, "month": month, "day": day}), errors="coerce"
+    ))
+    if not as_period:
+        return dates
+
+    shapes = np.select(
+        [parts["day"].notna(), parts["month"].notna(), parts["quarter"].notna(), parts["ayear"].notna()],
+        ["daily", "monthly", "quarterly", "annual"],
+        default="",
+    )
+    kinds = set(shapes.tolist())
+    if dates.hasnans or len(kinds) > 1:
+        raise ValueError(f"Cannot build a PeriodIndex from labels of frequencies {sorted(kinds)}")
+    freq = PERIOD_FREQ[kinds.pop()] if kinds else "D"
+    return dates.to_period(freq)
+
+
+def _merge_on_time(frames: List["pd.DataFrame"]) -> "pd.DataFrame":
+    """
+    Outer-join single-series frames on 'time', keeping their column order.
+
+    Frames fetched together share the same periods and are simply placed
+    side by side; otherwise rows are put back in chronological order.
+    """
+    import pandas as pd
+
+    if not frames:
+        return pd.DataFrame()
+    first = frames[0]["time"].tolist()
+    if all(f["time"].tolist() == first for f in frames[1:]):
+        merged = pd.concat([f.reset_index(drop=True) for f in frames], axis=1)
+        return merged.loc[:, ~merged.columns.duplicated()]
+
+    times = list(dict.fromkeys(t for f in frames for t in f["time"]))
+    dates = parse_period_labels(times)
+    if not dates.hasnans:
+        times = [times[i] for i in dates.argsort(kind="stable")]
+    merged = pd.DataFrame({"time": times})
+    for f in frames:
+        merged = merged.merge(f.drop_duplicates("time"), on="time", how="left")
+    return merged
+
+
+def _parse_periods(periods: List[Dict[str, Any]], codes: List[str]) -> "pd.DataFrame":
+    """
+    Build the 'time' + one-column-per-code frame from an API ``periods`` list.
+
+    All cells are converted in one NumPy pass into a float64 matrix;
+    missing markers such as "n.d." or "No Informado" become NaN.
+    The 'values' list follows the order of the requested codes; extra
+    values are named ``series_<i>``.
+    """
+    import numpy as np
+    import pandas as pd
+
+    if not periods:
+        return pd.DataFrame()
+
+    rows = [p["values"] for p in periods]
+    width = max(len(r) for r in rows)
+    if any(len(r) != width for r in rows):
+        # Ragged rows: pad so every period has a cell per column.
+        rows = [list(r) + [None] * (width - len(r)) for r in rows]
+    cells = np.fromiter(itertools.chain.from_iterable(rows), dtype=object,
+                        count=len(rows) * width)
+    cells[cells == "n.d."] = None
+    try:
+        values = cells.astype(np.float64)
+    except (ValueError, TypeError):
+        # Other markers ("No Informado", ...): coerce the slow way.
+        values = pd.to_numeric(cells, errors="coerce").astype(np.float64)
+    values = values.reshape(len(rows), width)
+
+    columns = [codes[i] if i < len(codes) else f"series_{i}" for i in range(width)]
+    df = pd.DataFrame(values, columns=columns)
+    df.insert(0, "time", [p["name"] for p in periods])
+    return df
+
+
+# Sort key (ns since epoch) of the first unparseable label; year ~2116.
+UNPARSED_PERIOD = 2 ** 62
+
+# Highest frequency first: its labels are kept when frequencies are aligned.
+FREQUENCY_ORDER = ["daily", "monthly", "quarterly", "annual"]
+
+
+def _with_period_index(df: "pd.DataFrame", frequency: str) -> "pd.DataFrame":
+    """
+    Replace the 'time' label column with a ``PeriodIndex`` at ``frequency``.
+
+    Lower-frequency labels in an aligned frame map to the period holding
+    their start date; unrecognized labels become ``NaT``.
+    """
+    import numpy as np
+    import pandas as pd
+
+    freq = PERIOD_FREQ.get(frequency, "D")
+    if df.empty or "time" not in df.columns:
+        return pd.DataFrame(index=pd.PeriodIndex([], freq=freq, name="time"))
+    index = parse_period_labels(df["time"]).to_period(freq).rename("time")
+    return df.drop(columns="time").set_axis(index).astype(np.float64)
+
+
+def _align_frequencies(frames: Dict[str, "pd.DataFrame"], codes: List[str]) -> "pd.DataFrame":
+    """
+    Outer-join frames of different frequencies on the start of each period.
+
+    The 'time' column keeps the label of the highest frequency present for
+    that date; series columns follow the order of ``codes``.
+    """
+    import numpy as np
+    import pandas as pd
+
+    merged = None
+    labels = []
+    unmatched = 0
+    ranked = sorted(frames.items(), key=lambda kv: FREQUENCY_ORDER.index(kv[0])
+                    if kv[0] in FREQUENCY_ORDER else len(FREQUENCY_ORDER))
+    for frequency, df in ranked:
+        if df.empty:
+            continue
+        df = df.rename(columns={"time": f"time_{frequency}"})
+        period = parse_period_labels(df[f"time_{frequency}"]).asi8.copy()
+        # Unparseable labels get keys past any real date, unique across
+        # frames, so they sort last and never join, instead of failing the
+        # whole request.
+        unparsed = period == np.iinfo(np.int64).min
+        period[unparsed] = UNPARSED_PERIOD + unmatched + np.arange(unparsed.sum())
+        unmatched += int(unparsed.sum())
+        df["_period"] = period
+        merged = df if merged is None else merged.merge(df, on="_period", how="outer", sort=False)
+        labels.append(f"time_{frequency}")
+
+    if merged is None:
+        return pd.DataFrame()
+    merged = merged.sort_values("_period", kind="stable").reset_index(drop=True)
+    time = merged[labels[0]]
+    for label in labels[1:]:
+        time = time.fillna(merged[label])
+    columns = [c for c in dict.fromkeys(codes) if c in merged.columns]
+    return pd.concat([time.rename("time"), merged[columns]], axis=1)
+
+
+# Catalog columns that are (nearly) unique per series; everything else that
+# holds strings is a candidate for a categorical.
+UNIQUE_COLUMNS = ("Código de serie", "Codigo de serie", "Nombre de serie")
+
+# Convert a string column when it has at most this many distinct values
+# per row.
+CATEGORICAL_MAX_RATIO = 0.5
+
+
+def _categorical_dtype():
+    import pandas as pd
+    return pd.CategoricalDtype
+
+
+def _compact_dtypes(df: "pd.DataFrame") -> "pd.DataFrame":
+    """
+    Convert repetitive string columns (frequency, group, source, unit...)
+    to categoricals.
+
+    Each distinct value is stored once and rows hold small integer codes,
+    which shrinks the catalog and makes equality filters integer compares.
+    Columns in ``UNIQUE_COLUMNS`` are left alone.
+    """
+    import pandas as pd
+
+    converted = {}
+    n_rows = len(df)
+    for col in df.columns:
+        series = df[col]
+        if col in UNIQUE_COLUMNS or n_rows == 0:
+            continue
+        if not (pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series)):
+            continue
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            continue
+        if series.nunique(dropna=True) <= n_rows * CATEGORICAL_MAX_RATIO:
+            converted[col] = series.astype("category")
+    return df.assign(**converted) if converted else df
+
+
+def _compact_catalog(df: "pd.DataFrame"):
+    """
+    Return ``_compact_dtypes(df)`` and a report of its categorical columns.
+
+    Memory is not measured here (a deep ``memory_usage`` scans every
+    string); ``_measure_compaction()`` fills it in when first asked for.
+    """
+    df = _compact_dtypes(df)
+    report = {
+        "categorical_columns": [
+            col for col in df.columns if isinstance(df[col].dtype, _categorical_dtype())
+        ],
+    }
+    return df, report
+
+
+def _measure_compaction(df: "pd.DataFrame", categorical_columns: List[str]) -> Dict[str, float]:
+    """
+    Catalog size in MB with and without its categorical columns compacted.
+
+    The uncompacted size is measured by expanding each categorical column
+    back to its categories' dtype.
+    """
+    after = df.memory_usage(deep=True)
+    before = after.copy()
+    for col in categorical_columns:
+        series = df[col]
+        before[col] = series.astype(series.cat.categories.dtype).memory_usage(deep=True, index=False)
+    return {
+        "before_mb": round(float(before.sum()) / 1e6, 2),
+        "after_mb": round(float(after.sum()) / 1e6, 2),
+    }
+
+
+def _lowered(series: "pd.Series") -> "pd.Series":
+    """Lower-cased strings of ``series``; categoricals only touch categories."""
+    import pandas as pd
+
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        categories = series.cat.categories.astype(str).str.lower()
+        if categories.is_unique:
+            return series.cat.rename_categories(categories)
+    return series.astype(object).fillna("").astype(str).str.lower()
+
+
+def _contains(values: "pd.Series", keyword: str) -> "np.ndarray":
+    """Boolean mask of ``values`` containing ``keyword`` (already lower-cased)."""
+    import numpy as np
+    import pandas as pd
+
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        hits = np.asarray(values.cat.categories.str.contains(keyword, regex=False), dtype=bool)
+        codes = values.cat.codes.to_numpy()
+        return np.where(codes >= 0, hits[codes], False)
+    return values.str.contains(keyword, regex=False).to_numpy(dtype=bool)
+
+
+def _pyarrow_available() -> bool:
+    """Whether pyarrow (needed for the Feather metadata cache) is installed."""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _read_feather_mapped(path: Path) -> "pd.DataFrame":
+    """
+    Load a Feather file through a read-only memory map.
+
+    The file is written uncompressed, so string columns come back as Arrow
+    arrays that point straight into the mapping instead of private copies.
+    Every process reading the same file shares those pages via the OS page
+    cache.
+
+    String columns are mapped to ``StringDtype("pyarrow")`` explicitly:
+    only pandas 3 keeps them Arrow-backed by default, older versions copy
+    every value into a private Python ``str``.
+    """
+    import pandas as pd
+    import pyarrow as pa
+    import pyarrow.feather as feather
+
+    strings = pd.StringDtype("pyarrow")
+    types = {pa.string(): strings, pa.large_string(): strings}
+    return feather.read_table(path, memory_map=True).to_pandas(types_mapper=types.get)
+
+
+def _write_atomic(path: Path, write: Callable[[str], None]):
+    """
+    Call ``write(tmp)`` on a temp file next to ``path``, then swap it in.
+
+    Readers never see a half-written cache, and a mapped Feather file is
+    replaced rather than truncated under the processes that still use it.
+    """
+    import tempfile
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+    os.close(fd)
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
 class BCRPMetadata:
     METADATA_URL = "https://estadisticas.bcrp.gob.pe/estadisticas/series/metadata"
     CACHE_FILENAME = "bcrp_metadata.json"
+    # Rows per read_csv() chunk when parsing a downloaded catalog.
+    CSV_CHUNK_ROWS = 5000
 
-    def __init__(self):
-        import pandas as pd
-        self.df = pd.DataFrame()
+    def __init__(self, max_age: float | None = None, clock: Callable[[], float] = time.time):
+        # Created on first access so constructing the client (at server
+        # import) does not import pandas.
+        self._df = None
         self._loaded = False
         self._cache_path = self._get_cache_path()
+        # SearchEngine built from ``df``; reused by solve() until refresh().
+        self._engine = None
+        # Categorical columns from _compact_dtypes(), see memory_report.
+        self._memory_report: Dict[str, Any] = {}
+        # Seconds after the last check before load() revalidates the cache
+        # in the background; 0 keeps the cache until it is deleted.
+        if max_age is None:
+            max_age = _number_from_env("BCRP_METADATA_MAX_AGE", 0.0, allow_zero=True)
+        self.max_age = max_age
+        self._clock = clock
+        self._refresh_lock = asyncio.Lock()
+        self._revalidation: asyncio.Task | None = None
 
     def _get_cache_path(self) -> Path:
         """Determine the best cache location for metadata."""
-        # Priority 1: Environment variable
-        if cache_dir := os.environ.get("BCRP_CACHE_DIR"):
-            path = Path(cache_dir)
-            path.mkdir(parents=True, exist_ok=True)
-            return path / self.CACHE_FILENAME
-        
-        # Priority 2: User cache directory
-        if os.name == 'nt':  # Windows
-            base = Path(os.environ.get("LOCALAPPDATA", Path.home() / "AppData" / "Local"))
-        else:  # Unix
-            base = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache"))
-        
-        cache_dir = base / "mcp_bcrp"
-        cache_dir.mkdir(parents=True, exist_ok=True)
-        return cache_dir / self.CACHE_FILENAME
+        return cache_dir() / self.CACHE_FILENAME
+
+    @property
+    def df(self) -> "pd.DataFrame":
+        """The catalog; an empty DataFrame until ``load()``."""
+        if self._df is None:
+            import pandas as pd
+            self._df = pd.DataFrame()
+        return self._df
+
+    @df.setter
+    def df(self, value: "pd.DataFrame"):
+        self._df = value
+
+    @property
+    def memory_report(self) -> Dict[str, Any]:
+        """
+        Catalog size before/after ``_compact_dtypes()`` and the columns it
+        converted. The sizes are measured on first access per catalog.
+        """
+        report = self._memory_report
+        if report and "after_mb" not in report:
+            report.update(_measure_compaction(self.df, report["categorical_columns"]))
+        return report
+
+    @property
+    def _binary_cache_path(self) -> Path:
+        """Arrow IPC (Feather) cache next to the JSON one."""
+        return self._cache_path.with_suffix(".feather")
+
+    @property
+    def _validators_path(self) -> Path:
+        """ETag, Last-Modified and content hash of the cached download."""
+        return self._cache_path.with_suffix(".validators.json")
+
+    def _has_cache(self) -> bool:
+        return (_pyarrow_available() and self._binary_cache_path.exists()) or self._cache_path.exists()
 
     async def load(self):
         """
         Load metadata from cache or download from BCRP.
         
-        First checks for local cache. If not found, downloads from
-        BCRP API and saves to cache for future use.
+        First checks for local cache, preferring the Feather file when
+        pyarrow is installed. An existing JSON cache is migrated to Feather
+        on first load. If no cache is found, downloads from BCRP API and
+        saves to cache for future use.
+
+        A cache last checked more than ``max_age`` seconds ago is served
+        as is while ``revalidate()`` refreshes it in the background.
         """
         if self._loaded and not self.df.empty:
             return
 
+        # Reading (and possibly migrating) the cache blocks on disk and
+        # pandas; keep the event loop free while it runs.
+        if await asyncio.to_thread(self._load_cache):
+            if self._is_stale():
+                self.revalidate()
+            return
+
+        await self.refresh()
+
+    def _binary_cache_is_current(self) -> bool:
+        """Whether the Feather cache exists and is not older than the JSON one."""
+        if not self._binary_cache_path.exists():
+            return False
+        if not self._cache_path.exists():
+            return True
+        return self._binary_cache_path.stat().st_mtime >= self._cache_path.stat().st_mtime
+
+    def _load_cache(self) -> bool:
+        """Install the cached catalog; ``False`` if there is none usable."""
+        import pandas as pd
+
+        if _pyarrow_available() and self._binary_cache_is_current():
+            logger.info(f"Loading metadata from cache: {self._binary_cache_path}")
+            try:
+                self._set_df(_read_feather_mapped(self._binary_cache_path))
+                self._loaded = True
+                return True
+            except Exception as e:
+                logger.warning(f"Failed to load cache: {e}")
+
         if self._cache_path.exists():
             logger.info(f"Loading metadata from cache: {self._cache_path}")
             try:
-                import pandas as pd
-                self.df = pd.read_json(self._cache_path, orient="records")
+                self._set_df(pd.DataFrame(fast_json.loads(self._cache_path.read_bytes())))
                 self._loaded = True
-                return
             except Exception as e:
                 logger.warning(f"Failed to load cache: {e}")
+            else:
+                if _pyarrow_available():
+                    logger.info("Migrating metadata cache from JSON to Feather")
+                    self._write_cache(self.df)
+                return True
 
-        await self.refresh()
+        return False
+
+    def _read_validators(self) -> Dict[str, Any]:
+        try:
+            return fast_json.loads(self._validators_path.read_bytes())
+        except (OSError, ValueError):
+            return {}
+
+    def _write_validators(self, validators: Dict[str, Any]):
+        _write_atomic(
+            self._validators_path,
+            lambda tmp: Path(tmp).write_text(fast_json.dumps(validators), encoding="utf-8"),
+        )
+
+    def _is_stale(self) -> bool:
+        """Whether the cache was last checked more than ``max_age`` ago."""
+        if not self.max_age:
+            return False
+        checked_at = self._read_validators().get("checked_at")
+        if checked_at is None:
+            path = self._binary_cache_path if self._binary_cache_path.exists() else self._cache_path
+            checked_at = path.stat().st_mtime
+        return self._clock() - checked_at > self.max_age
+
+    def revalidate(self) -> "asyncio.Task":
+        """
+        Refresh the catalog in the background (stale-while-revalidate).
+
+        ``df`` keeps answering searches until the new catalog is parsed and
+        swapped in; errors are logged and the old catalog is kept. Returns
+        the running task, shared by concurrent callers.
+        """
+        if self._revalidation is None or self._revalidation.done():
+            self._revalidation = asyncio.create_task(self._revalidate())
+        return self._revalidation
+
+    async def _revalidate(self):
+        try:
+            await self.refresh()
+        except Exception as e:
+            logger.warning(f"Background metadata refresh failed: {e}")
 
     async def refresh(self):
         """
         Fetch fresh metadata from BCRP API.
         
-        Downloads the complete metadata catalog (~17MB) and saves
-        to local cache as JSON for fast future searches.
+        Streams the complete metadata catalog (~17MB) to a temporary file,
+        parses it in chunks of ``CSV_CHUNK_ROWS`` rows and saves it to the
+        local cache (Feather with pyarrow, JSON otherwise) for fast future
+        searches. A failed download leaves ``df`` and the cache untouched.
+
+        When a cache exists the request is conditional on the stored ETag
+        and Last-Modified; a 304, or a body whose SHA-256 matches the
+        cached download, skips the parse and keeps the cached catalog.
         """
+        async with self._refresh_lock:
+            await self._refresh()
+
+    async def _refresh(self):
+        import tempfile
+
+        validators = self._read_validators() if self._has_cache() else {}
+        conditional = {}
+        if validators.get("etag"):
+            conditional["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            conditional["If-Modified-Since"] = validators["last_modified"]
+
         logger.info("Fetching fresh metadata from BCRP (this may take a moment)...")
-        headers = {
+        fd, tmp = tempfile.mkstemp(dir=self._cache_path.parent, prefix="metadata", suffix=".csv.part")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                resp, digest = await self._download(f, conditional)
+            unchanged = resp.status_code == 304 or (digest is not None and digest == validators.get("sha256"))
+            if not unchanged:
+                # Parsing, dtype compaction and the search index take
+                # seconds on the full catalog; keep the event loop serving
+                # the old one meanwhile.
+                df, report, engine = await asyncio.to_thread(self._prepare_catalog, tmp)
+        finally:
+            Path(tmp).unlink(missing_ok=True)
+
+        validators = {
+            "etag": resp.headers.get("ETag", validators.get("etag")),
+            "last_modified": resp.headers.get("Last-Modified", validators.get("last_modified")),
+            "sha256": validators.get("sha256") if unchanged else digest,
+            "checked_at": self._clock(),
+        }
+
+        if unchanged:
+            logger.info("Metadata not modified since last download; keeping cache")
+            if not self._loaded and not self._load_cache():
+                # The cache the validators describe is unreadable; fetch
+                # the catalog unconditionally instead.
+                self._validators_path.unlink(missing_ok=True)
+                return await self._refresh()
+        else:
+            self._install(df, report, engine)
+            self._loaded = True
+            # Save to cache
+            await asyncio.to_thread(self._write_cache, df)
+        self._write_validators(validators)
+
+    async def _download(self, f: BinaryIO, headers: Dict[str, str]):
+        """
+        Stream the catalog CSV into ``f`` without buffering it in memory.
+
+        Returns the response and the SHA-256 of the body (``None`` on 304).
+        """
+        import hashlib
+
+        client_headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
         }
         async with httpx.AsyncClient(
-            headers=headers,
+            headers=client_headers,
             follow_redirects=True,
             timeout=_timeout_from_env(),
         ) as client:
-            resp = await client.get(self.METADATA_URL)
-            resp.raise_for_status()
-            
-            content = resp.content
-            import pandas as pd
-            self.df = pd.read_csv(io.BytesIO(content), delimiter=";", encoding="latin-1")
-            
-            # Save to cache
-            self.df.to_json(self._cache_path, orient="records", date_format="iso", force_ascii=False)
-            self._loaded = True
-            logger.info(f"Metadata cached: {len(self.df)} series at {self._cache_path}")
+            async with client.stream("GET", self.METADATA_URL, headers=headers) as resp:
+                if resp.status_code == 304:
+                    return resp, None
+                resp.raise_for_status()
+                sha256 = hashlib.sha256()
+                async for chunk in resp.aiter_bytes():
+                    sha256.update(chunk)
+                    f.write(chunk)
+        return resp, sha256.hexdigest()
+
+    def _parse_csv(self, path: str) -> "pd.DataFrame":
+        """Read the downloaded catalog ``CSV_CHUNK_ROWS`` rows at a time."""
+        import pandas as pd
+        chunks = pd.read_csv(path, delimiter=";", encoding="latin-1", chunksize=self.CSV_CHUNK_ROWS)
+        return pd.concat(chunks, ignore_index=True)
+
+    def _set_df(self, df: "pd.DataFrame"):
+        """
+        Install a freshly loaded catalog.
+
+        Repetitive columns are converted to categoricals first; the memory
+        saved is reported by ``memory_report``.
+        """
+        self._install(*_compact_catalog(df))
+
+    def _prepare_catalog(self, path: str):
+        """Parse and compact a downloaded catalog and build its search engine."""
+        from mcp_bcrp.search_engine import SearchEngine
+
+        df, report = _compact_catalog(self._parse_csv(path))
+        return df, report, SearchEngine(df)
+
+    def _install(self, df: "pd.DataFrame", report: Dict[str, Any], engine=None):
+        # Plain attribute stores with no await in between: callers see
+        # either the old catalog and engine or the new pair. Without a
+        # prebuilt engine, the old one is dropped and _get_engine() rebuilds.
+        self._memory_report = report
+        self.df = df
+        self._engine = engine
+
+    def _write_cache(self, df: "pd.DataFrame"):
+        """
+        Persist the catalog as Feather when pyarrow is available, else JSON.
+
+        Only one format is kept: writing Feather removes a stale JSON cache.
+        """
+        if _pyarrow_available():
+            try:
+                _write_atomic(
+                    self._binary_cache_path,
+                    lambda tmp: df.reset_index(drop=True).to_feather(tmp, compression="uncompressed"),
+                )
+            except Exception as e:
+                # e.g. object columns mixing types that Arrow cannot infer
+                logger.warning(f"Feather cache failed ({e}); falling back to JSON")
+                # load() prefers Feather: drop the older file so it cannot
+                # shadow the JSON written below. Windows refuses to delete
+                # a mapped file; _load_cache() then skips it as older.
+                try:
+                    self._binary_cache_path.unlink(missing_ok=True)
+                except OSError as e:
+                    logger.warning(f"Could not remove stale Feather cache: {e}")
+            else:
+                self._cache_path.unlink(missing_ok=True)
+                logger.info(f"Metadata cached: {len(df)} series at {self._binary_cache_path}")
+                return
+
+        _write_atomic(
+            self._cache_path,
+            lambda tmp: df.to_json(tmp, orient="records", date_format="iso", force_ascii=False),
+        )
+        logger.info(f"Metadata cached: {len(df)} series at {self._cache_path}")
 
     def search(self, query: str, limit: int = 20) -> "pd.DataFrame":
         """
@@ -145,29 +745,61 @@ class BCRPMetadata:
             return {"error": "no_match", "reason": "metadata_not_loaded"}
         
         try:
-            from mcp_bcrp.search_engine import SearchEngine
+            engine = self._get_engine()
         except ImportError as e:
             logger.error(f"SearchEngine import failed: {e}")
             return {"error": "internal", "reason": str(e)}
         
-        engine = SearchEngine(self.df)
         return engine.solve(query)
 
+    def solve_many(self, queries: List[str]) -> List[dict]:
+        """
+        Batch version of ``solve()``.
+        Returns one result per query, in order, each shaped like ``solve()``.
+        """
+        if self.df.empty:
+            return [{"error": "no_match", "reason": "metadata_not_loaded"} for _ in queries]
+
+        try:
+            engine = self._get_engine()
+        except ImportError as e:
+            logger.error(f"SearchEngine import failed: {e}")
+            return [{"error": "internal", "reason": str(e)} for _ in queries]
+
+        return engine.solve_many(queries)
+
+    def _get_engine(self):
+        """
+        Return the SearchEngine for the current catalog, building it once.
+
+        Corpus preprocessing walks the whole catalog, so the engine is
+        cached on the instance and only rebuilt after ``refresh()`` (or a
+        fresh ``load()``) replaces ``df``.
+        """
+        if self._engine is None or self._engine.df is not self.df:
+            from mcp_bcrp.search_engine import SearchEngine
+            self._engine = SearchEngine(self.df)
+        return self._engine
+
     def _simple_search(self, query: str, limit: int = 20) -> "pd.DataFrame":
         """Fallback simple search"""
         import pandas as pd
-        # ... (Previous implementation moved here if needed, or just keep minimal)
         keywords = query.lower().split()
         search_cols = ["Nombre de serie", "Código de serie"]
         valid_cols = [c for c in search_cols if c in self.df.columns]
         if not valid_cols:
             return pd.DataFrame()
         
-        mask = pd.Series(True, index=self.df.index)
+        import numpy as np
+
+        # Lower-case each column once, not once per keyword. Categorical
+        # columns are matched on their categories and broadcast via codes.
+        columns = [_lowered(self.df[col]) for col in valid_cols]
+        mask = np.ones(len(self.df), dtype=bool)
         for kw in keywords:
-            kw_mask = pd.Series(False, index=self.df.index)
-            for col in valid_cols:
-                kw_mask |= self.df[col].fillna("").astype(str).str.contains(kw, case=False, regex=False)
+            kw_mask = np.zeros(len(self.df), dtype=bool)
+            for values in columns:
+                kw_mask |= _contains(values, kw)
             mask &= kw_mask
         return self.df[mask].head(limit)
 
@@ -199,25 +831,121 @@ class AsyncBCRPClient:
     """
     BASE_URL = "https://estadisticas.bcrp.gob.pe/estadisticas/series/api"
 
-    def __init__(self, timeout: float | None = None):
+    # Ranges longer than this many years are fetched as several requests
+    # (one per window) to keep responses small enough for BCRP_TIMEOUT.
+    CHUNK_YEARS = {"daily": 1}
+
+    def __init__(
+        self,
+        timeout: float | None = None,
+        max_connections: int = 10,
+        max_keepalive_connections: int = 5,
+        keepalive_expiry: float = 30.0,
+        http2: bool = False,
+        rate_limit: float | None = None,
+        burst: int | None = None,
+        max_concurrency: int | None = None,
+        cache: "SeriesCache | bool | None" = None,
+        max_codes_per_request: int | None = None,
+    ):
+        """
+        Args:
+            timeout: HTTP timeout in seconds (defaults to ``BCRP_TIMEOUT``).
+            max_connections: Upper bound on open connections in the pool.
+            max_keepalive_connections: Idle connections kept for reuse.
+            keepalive_expiry: Seconds an idle connection stays in the pool.
+            http2: Negotiate HTTP/2 (requires the ``h2`` package).
+            rate_limit: Requests per second sent to the API, ``0`` for no
+                limit (defaults to ``BCRP_RATE_LIMIT`` or 2.0).
+            burst: Requests allowed back-to-back before the rate applies
+                (defaults to ``BCRP_RATE_BURST`` or 1).
+            max_concurrency: Requests in flight at once (defaults to
+                ``BCRP_MAX_CONCURRENCY`` or 4).
+            cache: Observation cache for fetched series. ``True`` uses a
+                ``SeriesCache`` under the metadata cache directory, ``False``
+                disables it; defaults to enabled unless
+                ``BCRP_SERIES_CACHE=0``.
+            max_codes_per_request: Codes joined into one API URL before the
+                list is split into several requests (defaults to
+                ``BCRP_MAX_CODES_PER_REQUEST`` or 10).
+        """
         self.timeout = _timeout_from_env() if timeout is None else timeout
         self.headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
             "Accept": "application/json, text/plain, */*"
         }
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                logger.warning("http2=True requires the 'h2' package; falling back to HTTP/1.1")
+                http2 = False
+        self.http2 = http2
+
+        # Long-lived pooled client, created on first use and reused so
+        # keep-alive connections to the BCRP host survive between calls.
+        self._client: httpx.AsyncClient | None = None
+
+        # Politeness towards the BCRP host is a request rate (token bucket),
+        # independent from how many slow responses may overlap.
+        if rate_limit is None:
+            rate_limit = _number_from_env("BCRP_RATE_LIMIT", 2.0, allow_zero=True)
+        if burst is None:
+            burst = _number_from_env("BCRP_RATE_BURST", 1, cast=int)
+        if max_concurrency is None:
+            max_concurrency = _number_from_env("BCRP_MAX_CONCURRENCY", 4, cast=int)
+        self.rate_limiter = TokenBucket(rate_limit, burst)
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+
+        if max_codes_per_request is None:
+            max_codes_per_request = _number_from_env("BCRP_MAX_CODES_PER_REQUEST", 10, cast=int)
+        self.max_codes_per_request = max_codes_per_request
+
+        if cache is None:
+            cache = os.environ.get("BCRP_SERIES_CACHE", "1").strip().lower() not in ("0", "false", "no")
+        if cache is True:
+            cache = SeriesCache()
+        self.cache: SeriesCache | None = cache or None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the shared HTTP client, (re)creating it if needed."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                headers=self.headers,
+                follow_redirects=True,
+                limits=self.limits,
+                http2=self.http2,
+            )
+        return self._client
 
-        self.semaphore = asyncio.Semaphore(1)
+    async def aclose(self):
+        """Close the shared HTTP client and its pooled connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def __aenter__(self) -> "AsyncBCRPClient":
+        self._get_client()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
 
     async def _fetch(self, url: str) -> Dict[str, Any]:
-        """Internal helper to perform async GET request with concurrency limit."""
+        """Internal helper to perform async GET request with rate and concurrency limits."""
         async with self.semaphore:
-            async with httpx.AsyncClient(timeout=self.timeout, headers=self.headers, follow_redirects=True) as client:
-                logger.info(f"Fetching URL: {url} with headers: {self.headers}")
-                # Add delay to be nice to the server and avoid rate limit trigger even with sequential
-                await asyncio.sleep(0.5) 
-                response = await client.get(url)
-                response.raise_for_status()
-                return response.json()
+            await self.rate_limiter.acquire()
+            client = self._get_client()
+            logger.info(f"Fetching URL: {url} with headers: {self.headers}")
+            response = await client.get(url)
+            response.raise_for_status()
+            return fast_json.loads(response.content)
 
     def _detect_frequency(self, codes: List[str]) -> str:
         """
@@ -242,6 +970,13 @@ class AsyncBCRPClient:
                 return "annual"
         return "monthly"
 
+    def _group_by_frequency(self, codes: List[str]) -> Dict[str, List[str]]:
+        """Partition ``codes`` by suffix frequency, keeping the caller's order."""
+        groups: Dict[str, List[str]] = {}
+        for code in codes:
+            groups.setdefault(self._detect_frequency([code]), []).append(code)
+        return groups
+
     def _format_date_for_api(self, date_str: str, frequency: str = "monthly") -> str:
         """
         Format date based on frequency.
@@ -270,33 +1005,173 @@ class AsyncBCRPClient:
         self, 
         codes: List[str], 
         start_date: str = None, 
-        end_date: str = None
-    ) -> "pd.DataFrame":
+        end_date: str = None,
+        by_frequency: bool = False,
+        as_period_index: bool = False,
+    ) -> "pd.DataFrame | Dict[str, pd.DataFrame]":
         """
         Fetch statistical series data from BCRP API.
         
-        Automatically detects frequency from series code suffix and formats
-        dates accordingly (daily, monthly, quarterly, annual).
+        Automatically detects frequency from each series code suffix and
+        formats dates accordingly (daily, monthly, quarterly, annual). Codes
+        of different frequencies are requested separately and concurrently.
+        Series found in the observation cache (see ``SeriesCache``) for the
+        same period are served locally; expired entries are refreshed
+        incrementally by requesting only the periods from their last cached
+        one onwards, and only uncached codes are fetched in full.
         
         Args:
             codes: List of BCRP series codes (e.g., ["PN01652XM", "PD04638PD"])
             start_date: Start date in 'YYYY-MM' or 'YYYY-MM-DD' format
             end_date: End date in 'YYYY-MM' or 'YYYY-MM-DD' format
+            by_frequency: Return a dict of frequency -> DataFrame instead of
+                a single frame.
+            as_period_index: Index each frame by a ``PeriodIndex`` named
+                'time' (at the highest frequency present when frequencies
+                are mixed) instead of returning a 'time' column of labels.
+                Series columns are float64.
         
         Returns:
             pd.DataFrame with columns 'time' and one column per series code.
+            Mixed frequencies are aligned on the start of each period, with
+            'time' holding the label of the highest frequency available.
             Empty DataFrame if series not found or no data available.
         
         Raises:
             httpx.HTTPStatusError: If API returns error (except 404).
         """
-        code_str = "-".join(codes)
-        url = f"{self.BASE_URL}/{code_str}/json"
-        
-        # Detect frequency and format dates accordingly
-        frequency = self._detect_frequency(codes)
-        logger.info(f"Detected frequency: {frequency} for codes: {codes}")
-        
+        # Each code is one column and one cache entry; repeats add nothing.
+        codes = list(dict.fromkeys(codes))
+        groups = self._group_by_frequency(codes)
+        if not groups:
+            import pandas as pd
+            return {} if by_frequency else pd.DataFrame()
+        logger.info(f"Detected frequencies: {groups}")
+        results = await asyncio.gather(*(
+            self._get_frequency_group(group, frequency, start_date, end_date)
+            for frequency, group in groups.items()
+        ))
+        frames = dict(zip(groups, results))
+
+        if by_frequency:
+            if as_period_index:
+                return {f: _with_period_index(df, f) for f, df in frames.items()}
+            return frames
+        if len(frames) == 1:
+            df, frequency = results[0], next(iter(frames))
+        else:
+            df = _align_frequencies(frames, codes)
+            frequency = min(frames, key=lambda f: FREQUENCY_ORDER.index(f)
+                            if f in FREQUENCY_ORDER else len(FREQUENCY_ORDER))
+        return _with_period_index(df, frequency) if as_period_index else df
+
+    async def _get_frequency_group(
+        self, codes: List[str], frequency: str, start_date: str | None, end_date: str | None
+    ) -> "pd.DataFrame":
+        """Fetch codes sharing one frequency, through the observation cache."""
+        import pandas as pd
+
+        s_date, e_date = self._resolve_range(start_date, end_date, frequency)
+
+        frames = {}
+        missing = []
+        stale = {}
+        for code in codes:
+            entry = self.cache.load(code, frequency, s_date, e_date) if self.cache else None
+            if entry is None:
+                missing.append(code)
+            elif self.cache.is_fresh(entry, frequency):
+                frames[code] = pd.DataFrame({"time": entry["time"], code: entry["values"]})
+            elif entry["time"]:
+                stale[code] = entry
+            else:
+                missing.append(code)
+        if stale:
+            # A tail starts from the last cached period; entries whose last
+            # label does not parse are fetched in full.
+            last = parse_period_labels([entry["time"][-1] for entry in stale.values()])
+            for code in [code for code, date in zip(stale, last) if date is pd.NaT]:
+                missing.append(code)
+                del stale[code]
+        if frames:
+            logger.info(f"Serving {list(frames)} from series cache")
+
+        # Stale entries only need the periods after their last cached one.
+        # Codes sharing the same last period are refreshed together.
+        tails = {}
+        for code, entry in stale.items():
+            tails.setdefault(entry["time"][-1], []).append(code)
+
+        async def fetch_missing():
+            fetched = await self._request_series(missing, frequency, s_date, e_date)
+            for code in missing:
+                if code in fetched.columns:
+                    frames[code] = fetched[["time", code]]
+                    self._store(code, frequency, s_date, e_date, fetched["time"], fetched[code])
+
+        async def fetch_tail(last_period, tail_codes):
+            tail_start = self._period_to_api_date(last_period, frequency)
+            tail_end = e_date or self._api_date(datetime.date.today(), frequency)
+            logger.info(f"Refreshing {tail_codes} from {tail_start} to {tail_end}")
+            try:
+                fetched = await self._request_series(tail_codes, frequency, tail_start, tail_end)
+            except Exception as e:
+                # The cached history is still usable: serve it rather than
+                # failing a request that a full fetch might also fail.
+                logger.warning(f"Tail refresh of {tail_codes} failed ({e}); serving cached data")
+                for code in tail_codes:
+                    entry = stale[code]
+                    frames[code] = pd.DataFrame({"time": entry["time"], code: entry["values"]})
+                return
+            for code in tail_codes:
+                entry = stale[code]
+                # Re-fetched periods overwrite cached values (revisions);
+                # new periods are appended after the cached history.
+                merged = dict(zip(entry["time"], entry["values"]))
+                if code in fetched.columns:
+                    merged.update(zip(fetched["time"], fetched[code]))
+                frame = pd.DataFrame({"time": list(merged), code: list(merged.values())})
+                frame[code] = frame[code].astype(float)
+                frames[code] = frame
+                self._store(code, frequency, s_date, e_date, frame["time"], frame[code])
+
+        tasks = [fetch_tail(last, group) for last, group in tails.items()]
+        if missing:
+            tasks.append(fetch_missing())
+        await asyncio.gather(*tasks)
+
+        return _merge_on_time([frames[c] for c in codes if c in frames])
+
+    def _store(self, code: str, frequency: str, s_date, e_date, times, values):
+        """Write one series to the observation cache (NaN stored as null)."""
+        if not self.cache:
+            return
+        values = values.astype(object).where(values.notna(), None)
+        self.cache.put(code, frequency, s_date, e_date, list(times), values.tolist())
+
+    def _period_to_api_date(self, label: str, frequency: str) -> str:
+        """Convert a BCRP period label (e.g. ``Ene.2024``) to an API URL date."""
+        return self._api_date(parse_period_labels([label])[0].date(), frequency)
+
+    @staticmethod
+    def _api_date(date: datetime.date, frequency: str) -> str:
+        """
+        Format the period holding ``date`` for the API URL.
+        - Daily: YYYY-M-D, Monthly: YYYY-M
+        - Quarterly: YYYY-Q (e.g., 2024-3), Annual: YYYY
+        """
+        if frequency == "daily":
+            return f"{date.year}-{date.month}-{date.day}"
+        if frequency == "quarterly":
+            return f"{date.year}-{(date.month - 1) // 3 + 1}"
+        if frequency == "annual":
+            return str(date.year)
+        return f"{date.year}-{date.month}"
+
+    def _resolve_range(
+        self, start_date: str | None, end_date: str | None, frequency: str
+    ) -> tuple:
+        """Return the (start, end) dates formatted for the API URL."""
         s_date = self._format_date_for_api(start_date, frequency)
         e_date = self._format_date_for_api(end_date, frequency)
         
@@ -309,11 +1184,88 @@ class AsyncBCRPClient:
                 year, month = int(e_parts[0]), int(e_parts[1])
                 last_day = calendar.monthrange(year, month)[1]
                 e_date = f"{year}-{month}-{last_day}"
-        
+
+        if s_date and not e_date:
+            e_date = s_date
+        return s_date, e_date
+
+    def _split_range(self, s_date: str | None, e_date: str | None, frequency: str) -> list:
+        """
+        Split an API-formatted range into calendar-year aligned windows of
+        ``CHUNK_YEARS[frequency]`` years. Ranges without both ends, or for
+        frequencies without a chunk size, are returned as a single window.
+        """
+        years = self.CHUNK_YEARS.get(frequency)
+        if not years or not s_date or not e_date:
+            return [(s_date, e_date)]
+        start = [int(p) for p in s_date.split('-')]
+        end = [int(p) for p in e_date.split('-')]
+        if end[0] - start[0] < years:
+            return [(s_date, e_date)]
+
+        # Window boundaries in the same precision as the input dates.
+        first = "-".join(["{}"] + ["1"] * (len(start) - 1))
+        last = {3: "{}-12-31", 2: "{}-12"}.get(len(end), "{}")
+        windows = []
+        window_start = s_date
+        for year in range(start[0] + years - 1, end[0], years):
+            windows.append((window_start, last.format(year)))
+            window_start = first.format(year + 1)
+        windows.append((window_start, e_date))
+        return windows
+
+    async def _request_series(
+        self, codes: List[str], frequency: str, s_date: str | None, e_date: str | None
+    ) -> "pd.DataFrame":
+        """
+        Fetch ``codes`` for an API-formatted range.
+
+        Code lists longer than ``max_codes_per_request`` are split into
+        batches fetched concurrently and merged on 'time' in the order of
+        ``codes``.
+        """
+        size = self.max_codes_per_request
+        batches = [codes[i:i + size] for i in range(0, len(codes), size)]
+        if len(batches) == 1:
+            return await self._request_batch(codes, frequency, s_date, e_date)
+
+        logger.info(f"Splitting {len(codes)} codes into {len(batches)} requests")
+        parts = await asyncio.gather(*(
+            self._request_batch(batch, frequency, s_date, e_date) for batch in batches
+        ))
+        return _merge_on_time([p for p in parts if not p.empty])
+
+    async def _request_batch(
+        self, codes: List[str], frequency: str, s_date: str | None, e_date: str | None
+    ) -> "pd.DataFrame":
+        """
+        Fetch one batch of ``codes`` for an API-formatted range.
+
+        Long ranges are split by ``_split_range`` and the windows are fetched
+        concurrently (still paced by the rate limiter), then stitched back in
+        chronological order with duplicate boundary periods dropped.
+        """
+        windows = self._split_range(s_date, e_date, frequency)
+        if len(windows) == 1:
+            return await self._request_window(codes, s_date, e_date)
+
+        logger.info(f"Splitting {s_date}/{e_date} into {len(windows)} requests")
+        import pandas as pd
+        parts = await asyncio.gather(*(self._request_window(codes, s, e) for s, e in windows))
+        parts = [p for p in parts if not p.empty]
+        if not parts:
+            return pd.DataFrame()
+        df = pd.concat(parts, ignore_index=True)
+        return df.drop_duplicates("time", keep="last").reset_index(drop=True)
+
+    async def _request_window(
+        self, codes: List[str], s_date: str | None, e_date: str | None
+    ) -> "pd.DataFrame":
+        """Fetch ``codes`` for an API-formatted range in a single request."""
+        code_str = "-".join(codes)
+        url = f"{self.BASE_URL}/{code_str}/json"
         if s_date and e_date:
              url += f"/{s_date}/{e_date}"
-        elif s_date:
-             url += f"/{s_date}/{s_date}"
 
         try:
             data = await self._fetch(url)
@@ -328,26 +1280,4 @@ class AsyncBCRPClient:
             import pandas as pd
             return pd.DataFrame()
 
-        records = []
-        for p in data["periods"]:
-            row = {"time": p["name"]}
-            # 'values' list corresponds to the order of requested codes (mostly)
-            # but sometimes BCRP returns "n.d."
-            for i, val in enumerate(p["values"]):
-                col_name = codes[i] if i < len(codes) else f"series_{i}"
-                try:
-                    # Handle "n.d." or other non-numeric
-                    if isinstance(val, str) and "nir" in val.lower(): # sometimes they return 'No Informado' etc
-                         row[col_name] = None
-                    elif val == "n.d.":
-                         row[col_name] = None
-                    else:
-                        row[col_name] = float(val)
-                except (ValueError, TypeError):
-                    row[col_name] = None
-            records.append(row)
-
-        import pandas as pd
-        df = pd.DataFrame(records)
-        return df
-
+        return _parse_periods(data["periods"], codes)
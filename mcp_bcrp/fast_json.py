@@ -0,0 +1,69 @@
+"""
+JSON decoding/encoding with an optional fast backend.
+
+orjson or msgspec is used when installed (``pip install "mcp-bcrp[fast]"``),
+otherwise the standard library. All backends accept ``bytes`` or ``str``
+and produce the same Python objects; ``dumps`` always returns ``str`` with
+non-ASCII characters kept as-is (like ``ensure_ascii=False``). Invalid
+input raises ``ValueError`` whatever the backend.
+"""
+
+import json
+from typing import Any, Callable, Dict, Tuple
+
+
+def _stdlib_loads(data):
+    return json.loads(data)
+
+
+def _stdlib_dumps(obj, indent: bool = False) -> str:
+    return json.dumps(obj, ensure_ascii=False, indent=2 if indent else None)
+
+
+BACKENDS: Dict[str, Tuple[Callable[[Any], Any], Callable[..., str]]] = {
+    "json": (_stdlib_loads, _stdlib_dumps),
+}
+
+try:
+    import msgspec
+
+    def _msgspec_loads(data):
+        try:
+            return msgspec.json.decode(data)
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e)) from e
+
+    def _msgspec_dumps(obj, indent: bool = False) -> str:
+        data = msgspec.json.encode(obj)
+        if indent:
+            data = msgspec.json.format(data, indent=2)
+        return data.decode("utf-8")
+
+    BACKENDS["msgspec"] = (_msgspec_loads, _msgspec_dumps)
+except ImportError:
+    pass
+
+try:
+    import orjson
+
+    def _orjson_dumps(obj, indent: bool = False) -> str:
+        option = orjson.OPT_SERIALIZE_NUMPY | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, option=option).decode("utf-8")
+
+    BACKENDS["orjson"] = (orjson.loads, _orjson_dumps)
+except ImportError:
+    pass
+
+# Preference order: orjson, msgspec, stdlib.
+BACKEND = next(name for name in ("orjson", "msgspec", "json") if name in BACKENDS)
+_loads, _dumps = BACKENDS[BACKEND]
+
+
+def loads(data) -> Any:
+    """Decode JSON from ``bytes`` or ``str``."""
+    return _loads(data)
+
+
+def dumps(obj: Any, indent: bool = False) -> str:
+    """Encode ``obj`` as JSON text, pretty-printed with 2 spaces if ``indent``."""
+    return _dumps(obj, indent)
@@ -0,0 +1,59 @@
+"""
+Token-bucket rate limiter for outgoing BCRP API requests.
+
+The bucket refills at ``rate`` tokens per second up to ``burst`` tokens;
+each request takes one token and waits for a refill when the bucket is
+empty. Clock and sleep are injectable so tests can drive time by hand.
+"""
+
+import asyncio
+import time
+from typing import Awaitable, Callable
+
+
+class TokenBucket:
+    """
+    Async token bucket.
+
+    Args:
+        rate: Tokens added per second. ``0`` disables limiting.
+        burst: Bucket capacity, i.e. requests allowed back-to-back.
+        clock: Monotonic time source in seconds.
+        sleep: Coroutine function used to wait for a refill.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ):
+        if rate < 0:
+            raise ValueError("rate must be >= 0")
+        if burst < 1:
+            raise ValueError("burst must be >= 1")
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(burst)
+        self._updated = clock()
+        # Waiters queue on the lock, so tokens are granted in FIFO order.
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        """Wait until a token is available and take it."""
+        if self.rate == 0:
+            return
+        async with self._lock:
+            self._refill()
+            while self._tokens < 1:
+                await self._sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
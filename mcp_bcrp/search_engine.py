@@ -9,16 +9,18 @@ Pipeline:
 5. Interactive Candidate Resolution
 """
 
+import numpy as np
 import pandas as pd
 import logging
 import unicodedata
 import re
-from typing import Dict, Any
+from typing import Dict, Any, List
 
 try:
-    from rapidfuzz import fuzz
+    from rapidfuzz import fuzz, process
 except ImportError:
     fuzz = None
+    process = None
 
 logger = logging.getLogger("mcp_bcrp")
 
@@ -46,14 +48,37 @@ class SearchEngine:
         "internacional": "lme londres Chicago nymex",
     }
 
-    def __init__(self, metadata_df: pd.DataFrame):
+    # Queries scored per process.cdist call in solve_many(); bounds the
+    # query x corpus score matrix (64 x 20k float64 is ~10MB).
+    BATCH_SIZE = 64
+
+    # Inverted index keys are token prefixes, so plural and gender variants
+    # ("exportacion"/"exportaciones") share a posting list.
+    INDEX_PREFIX_LEN = 6
+
+    # Shortlists smaller than this fall back to scoring the full corpus
+    # (e.g. misspelled queries that share no token with any series).
+    MIN_CANDIDATES = 50
+
+    def __init__(
+        self,
+        metadata_df: pd.DataFrame,
+        use_index: bool = True,
+        min_candidates: int | None = None,
+    ):
         """
         Initialize search engine with BCRP metadata.
         
         Args:
             metadata_df: DataFrame with BCRP series metadata.
+            use_index: Shortlist candidates through the inverted token index
+                before fuzzy scoring. ``False`` always scores every series.
+            min_candidates: Shortlist size below which a query is scored
+                against the full corpus. Defaults to ``MIN_CANDIDATES``.
         """
         self.df = metadata_df
+        self.use_index = use_index
+        self.min_candidates = self.MIN_CANDIDATES if min_candidates is None else min_candidates
         self._preprocess_metadata()
 
     def _normalize(self, text: str) -> str:
@@ -113,74 +138,253 @@ class SearchEngine:
             
         return attrs
 
+    @staticmethod
+    def _token_pattern(words) -> str:
+        """Regex matching any of ``words`` as a whole whitespace-delimited token."""
+        alternatives = "|".join(re.escape(w) for w in words)
+        return rf"(?<!\S)(?:{alternatives})(?!\S)"
+
+    def _normalize_column(self, names: pd.Series) -> pd.Series:
+        """
+        Column-wise equivalent of ``_normalize`` for the whole catalog.
+
+        Each step maps to a vectorized pandas string operation so the
+        corpus is normalized without a Python-level loop per series.
+        """
+        names = names.str.lower()
+        names = names.str.normalize('NFKD').str.encode('ascii', 'ignore').str.decode('utf-8')
+        names = names.str.replace(r'[^\w\s]', ' ', regex=True)
+
+        for syn, target in self.SYNONYMS.items():
+            # Cheap substring test first; the token regex only runs on hits.
+            candidates = names[names.str.contains(syn, regex=False)]
+            has_syn = candidates.str.contains(self._token_pattern([syn]), regex=True)
+            if has_syn.any():
+                hits = candidates[has_syn]
+                names.loc[hits.index] = hits.str.replace(syn, target, regex=False)
+
+        names = names.str.replace(self._token_pattern(self.STOPWORDS), ' ', regex=True)
+        return names.str.replace(r'\s+', ' ', regex=True).str.strip()
+
+    def _extract_attributes_column(self, names_norm: pd.Series) -> pd.DataFrame:
+        """Column-wise equivalent of ``_extract_attributes`` (as categoricals)."""
+        tokens = names_norm.reset_index(drop=True).str.split().explode().dropna()
+        positions = tokens.index.to_numpy()
+        n = len(names_norm)
+
+        def has_any(words):
+            return np.bincount(positions[tokens.isin(words).to_numpy()], minlength=n) > 0
+
+        def pick(rules, categories):
+            values = np.select([has_any(words) for words in rules], categories, default=None)
+            return pd.Categorical(values, categories=categories)
+
+        return pd.DataFrame({
+            "currency": pick([['us', 'usd', 'dolares'], ['s', 'pen', 'soles']], ['usd', 'pen']),
+            "side": pick([['compra'], ['venta']], ['compra', 'venta']),
+            "horizon": pick([['corto'], ['largo']], ['corto', 'largo']),
+        }, index=names_norm.index)
+
     def _preprocess_metadata(self):
-        """Pre-calculate normalized search corpus."""
+        """
+        Pre-calculate normalized search corpus.
+
+        ``search_corpus`` is a DataFrame with one row per series and the
+        columns ``idx``, ``codigo_serie``, ``name_original``, ``name_norm``,
+        ``currency``, ``side`` and ``horizon`` (attributes are categoricals).
+        """
         if self.df.empty:
-            self.search_corpus = []
+            self.search_corpus = pd.DataFrame(
+                columns=["idx", "codigo_serie", "name_original", "name_norm",
+                         "currency", "side", "horizon"]
+            )
+            self._build_scoring_arrays()
             return
 
-        processed = []
-        for idx, row in self.df.iterrows():
-            raw_name = str(row.get('Nombre de serie', ''))
-            name_norm = self._normalize(raw_name)
-            attrs = self._extract_attributes(name_norm)
-            
-            # Use original code column names if possible
-            code = row.get("Código de serie") or row.get("Codigo de serie")
-            
-            item = {
-                "idx": idx,
-                "codigo_serie": code,
-                "name_original": raw_name,
-                "name_norm": name_norm,
-                "tokens": set(name_norm.split()),
-                "currency": attrs['currency'],
-                "side": attrs['side'],
-                "horizon": attrs['horizon']
-            }
-            processed.append(item)
-            
-        self.search_corpus = processed
+        if 'Nombre de serie' in self.df.columns:
+            raw_names = self.df['Nombre de serie'].fillna('').astype(str)
+        else:
+            raw_names = pd.Series('', index=self.df.index)
+
+        # Use original code column names if possible
+        code_col = "Código de serie" if "Código de serie" in self.df.columns else "Codigo de serie"
+        codes = self.df[code_col] if code_col in self.df.columns else pd.Series(None, index=self.df.index)
+
+        # Catalog names repeat across frequencies and regions: normalize
+        # each distinct name once and broadcast back with the factor codes.
+        name_codes, unique_names = pd.factorize(raw_names)
+        unique_norm = self._normalize_column(pd.Series(unique_names, dtype=object))
+        unique_attrs = self._extract_attributes_column(unique_norm)
+        # As object dtype, repeated names reference one string each.
+        names_norm = unique_norm.astype(object).take(name_codes)
+        attrs = unique_attrs.take(name_codes)
+
+        # ``.array`` keeps catalog columns in their backing storage (e.g. the
+        # memory-mapped Arrow buffers) instead of copying out Python strings.
+        corpus = pd.DataFrame({
+            "idx": self.df.index,
+            "codigo_serie": codes.array,
+            "name_original": raw_names.array,
+            "name_norm": pd.Series(names_norm.to_numpy(), dtype=object),
+        })
+        for col in ("currency", "side", "horizon"):
+            corpus[col] = attrs[col].array
+        self.search_corpus = corpus
+        self._build_scoring_arrays()
+
+    def _build_scoring_arrays(self):
+        """Flatten ``search_corpus`` into the plain lists/arrays solve() scores."""
+        corpus = self.search_corpus
+        # ``name_norm`` holds one string per distinct name, so the list
+        # holds references only; codes and original names are read for
+        # matches only and stay column arrays.
+        self._names_norm = corpus['name_norm'].tolist()
+        self._names_original = corpus['name_original'].array
+        self._codes = corpus['codigo_serie'].array
+        # Categorical codes: -1 for no side, otherwise index into categories.
+        side = corpus['side'].astype(pd.CategoricalDtype(['compra', 'venta']))
+        self._side_categories = list(side.cat.categories)
+        self._side_codes = side.cat.codes.to_numpy()
+        self._build_token_index()
+
+    def _build_token_index(self):
+        """Build the inverted index: token prefix -> corpus positions."""
+        tokens = pd.Series(self._names_norm, dtype=object).str.split().explode().dropna()
+        keys = tokens.str[:self.INDEX_PREFIX_LEN]
+        positions = keys.index.to_numpy()
+        key_codes, unique_keys = pd.factorize(keys)
+        order = np.argsort(key_codes, kind='stable')
+        bounds = np.cumsum(np.bincount(key_codes, minlength=len(unique_keys)))[:-1]
+        self._token_index = dict(zip(unique_keys, np.split(positions[order], bounds)))
+
+    def _shortlist(self, q_norm: str) -> np.ndarray | None:
+        """
+        Corpus positions sharing at least one token prefix with the query.
+        Returns ``None`` when the full corpus should be scored instead.
+        """
+        if not self.use_index:
+            return None
+        keys = {t[:self.INDEX_PREFIX_LEN] for t in q_norm.split()}
+        postings = [self._token_index[k] for k in keys if k in self._token_index]
+        if not postings:
+            return None
+        candidates = np.unique(np.concatenate(postings))
+        if len(candidates) < self.min_candidates:
+            return None
+        return candidates
+
+    def _raw_scores(self, q_norms: List[str], positions: np.ndarray | None) -> np.ndarray:
+        """Fuzzy scores of ``q_norms`` against the corpus (or ``positions`` of it)."""
+        names = self._names_norm if positions is None else [self._names_norm[i] for i in positions]
+        if fuzz is None:
+            # Basic token overlap fallback
+            names_tokens = [set(name.split()) for name in names]
+            scores = np.array([
+                [len(q_tokens & tokens) for tokens in names_tokens]
+                for q_tokens in (set(q.split()) for q in q_norms)
+            ], dtype=np.float64).reshape(len(q_norms), len(names))
+            return scores * (100.0 / np.array([len(q.split()) for q in q_norms]))[:, None]
+        # Token Set Ratio is perfect for finding "query" inside "long technical title".
+        # cdist scores the query x corpus matrix in C, spread over all cores.
+        return process.cdist(
+            q_norms, names,
+            scorer=fuzz.token_set_ratio, dtype=np.float64, workers=-1,
+        )
+
+    def _score(self, q_norms: List[str], q_attrs: List[Dict[str, Any]]) -> np.ndarray:
+        """
+        Score each normalized query against its candidate series.
+
+        Candidates come from the inverted token index (see ``_shortlist``).
+        Returns a float64 ``(len(q_norms), len(search_corpus))`` matrix that
+        already includes the compra/venta side adjustment; series that were
+        not candidates score ``-inf``.
+        """
+        shortlists = [self._shortlist(q) for q in q_norms]
+        full = [i for i, c in enumerate(shortlists) if c is None]
+        pruned = [i for i, c in enumerate(shortlists) if c is not None]
+
+        # Series outside a query's shortlist are never scored.
+        scores = np.full((len(q_norms), len(self._names_norm)), -np.inf)
+        if full:
+            scores[full] = self._raw_scores([q_norms[i] for i in full], None)
+        if pruned:
+            # One cdist call over the union of shortlists, then each row keeps
+            # only its own candidates so a result never depends on the batch.
+            union = np.unique(np.concatenate([shortlists[i] for i in pruned]))
+            sub = self._raw_scores([q_norms[i] for i in pruned], union)
+            for row, i in zip(sub, pruned):
+                scores[i, shortlists[i]] = row[np.searchsorted(union, shortlists[i])]
+
+        # Boost if specific side (compra/venta) matches, penalize the opposite side
+        q_sides = np.array([
+            self._side_categories.index(a['side']) if a['side'] else -1 for a in q_attrs
+        ])
+        with_side = q_sides >= 0
+        if with_side.any():
+            same = self._side_codes[None, :] == q_sides[with_side, None]
+            other = (self._side_codes[None, :] >= 0) & ~same
+            scores[with_side] += np.where(same, 5.0, np.where(other, -10.0, 0.0))
+        return scores
 
     def solve(self, query: str) -> Dict[str, Any]:
         """
         Resolve query with interactive candidate logic.
         """
-        if not self.search_corpus:
-            return {"error": "no_match", "reason": "empty_corpus"}
+        return self.solve_many([query])[0]
 
-        q_norm = self._normalize(query)
-        q_attrs = self._extract_attributes(q_norm)
-        q_tokens = set(q_norm.split())
-        
-        if not q_tokens:
-            return {"error": "no_match", "reason": "empty_query"}
-
-        # Scoring
-        scored = []
-        for c in self.search_corpus:
-            if not fuzz:
-                # Basic token overlap fallback
-                intersection = len(q_tokens & c['tokens'])
-                score = (intersection / len(q_tokens)) * 100 if q_tokens else 0
+    def solve_many(self, queries: List[str]) -> List[Dict[str, Any]]:
+        """
+        Resolve several queries at once.
+
+        Queries are normalized up front (duplicates after normalization are
+        scored once) and scored as a query x corpus matrix in slices of
+        ``BATCH_SIZE`` rows to bound memory.
+
+        Returns:
+            One result per query, in order, each shaped like ``solve()``.
+        """
+        if self.search_corpus.empty:
+            return [{"error": "no_match", "reason": "empty_corpus"} for _ in queries]
+
+        q_norms = [self._normalize(q) for q in queries]
+        by_norm: Dict[str, Dict[str, Any]] = {}
+        pending = []
+        for q_norm in q_norms:
+            if q_norm in by_norm:
+                continue
+            if not q_norm.split():
+                by_norm[q_norm] = {"error": "no_match", "reason": "empty_query"}
             else:
-                # Token Set Ratio is perfect for finding "query" inside "long technical title"
-                score = fuzz.token_set_ratio(q_norm, c['name_norm'])
-            
-            # Boost if specific side (compra/venta) matches
-            if q_attrs['side'] and c['side'] == q_attrs['side']:
-                score += 5
-            elif q_attrs['side'] and c['side'] and c['side'] != q_attrs['side']:
-                score -= 10
-            
-            if score >= 65:
-                scored.append({
-                    "codigo_serie": c['codigo_serie'],
-                    "name": c['name_original'],
-                    "score": score
-                })
+                by_norm[q_norm] = None
+                pending.append(q_norm)
+
+        for start in range(0, len(pending), self.BATCH_SIZE):
+            batch = pending[start:start + self.BATCH_SIZE]
+            attrs = [self._extract_attributes(q) for q in batch]
+            for q_norm, row in zip(batch, self._score(batch, attrs)):
+                by_norm[q_norm] = self._resolve(row)
 
-        scored.sort(key=lambda x: x['score'], reverse=True)
+        # Copies keep callers from mutating a result shared by duplicates.
+        return [dict(by_norm[q_norm]) for q_norm in q_norms]
+
+    def _resolve(self, scores: np.ndarray) -> Dict[str, Any]:
+        """Turn a corpus-aligned score array into a match, ambiguity or no_match."""
+        # Stable sort keeps catalog order among equal scores.
+        keep = np.flatnonzero(scores >= 65)
+        order = keep[np.argsort(-scores[keep], kind='stable')]
+        scored = [
+            {
+                "codigo_serie": code,
+                "name": name,
+                "score": score
+            }
+            for code, name, score in zip(
+                self._codes.take(order).tolist(),
+                self._names_original.take(order).tolist(),
+                scores[order].tolist(),
+            )
+        ]
         
         if not scored:
             return {"error": "no_match", "reason": "low_confidence"}
@@ -1,21 +1,131 @@
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Optional, TYPE_CHECKING
 from fastmcp import FastMCP
-from mcp_bcrp.client import AsyncBCRPClient, BCRPMetadata
-import json
+from mcp_bcrp import fast_json
+from mcp_bcrp.client import AsyncBCRPClient, BCRPMetadata, _number_from_env, parse_period_labels
+import asyncio
+import importlib
 import logging
 import tempfile
+import time
 import os
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 # Setup Logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("mcp_bcrp")
 
-# Initialize FastMCP
-mcp = FastMCP("bcrp-agent")
-
 # Initialize Clients
 bcrp_client = AsyncBCRPClient()
 metadata_client = BCRPMetadata()
 
+# Seconds between scheduled catalog refreshes (0 disables them).
+METADATA_REFRESH_INTERVAL = _number_from_env(
+    "BCRP_METADATA_REFRESH_INTERVAL", 24 * 3600.0, allow_zero=True
+)
+
+async def _refresh_metadata_periodically(interval: float, sleep=asyncio.sleep):
+    """
+    Refresh the metadata catalog every ``interval`` seconds.
+
+    refresh() is conditional (304s are cheap), parses off the event loop and
+    swaps the new DataFrame and search index in atomically, so tool calls
+    keep answering from the previous catalog meanwhile. Failures are logged
+    and retried on the next tick.
+    """
+    while True:
+        await sleep(interval)
+        try:
+            await metadata_client.refresh()
+        except Exception as e:
+            logger.warning(f"Scheduled metadata refresh failed: {e}")
+
+WARMUP_MODES = ("off", "background", "blocking")
+
+def _warmup_mode_from_env(default: str = "background") -> str:
+    """Return the ``BCRP_WARMUP`` mode: off, background or blocking."""
+    mode = os.environ.get("BCRP_WARMUP", default).strip().lower() or default
+    if mode not in WARMUP_MODES:
+        logger.warning("Invalid BCRP_WARMUP=%r; using %s", mode, default)
+        return default
+    return mode
+
+# How the metadata catalog and search index are prepared at startup.
+WARMUP = _warmup_mode_from_env()
+
+async def _warm_up():
+    """
+    Load the metadata catalog and build the search index ahead of the first
+    tool call, logging the time to ready. Failures are logged; tools then
+    load lazily as before.
+    """
+    started = time.perf_counter()
+    try:
+        # pandas and the search engine are imported lazily; pull them in on a
+        # worker thread so the event loop keeps answering the MCP handshake.
+        await asyncio.to_thread(importlib.import_module, "mcp_bcrp.search_engine")
+        await metadata_client.load()
+        # Index construction is CPU-bound; keep the event loop responsive.
+        await asyncio.to_thread(metadata_client._get_engine)
+    except Exception as e:
+        logger.warning(f"Metadata warm-up failed: {e}")
+        return
+    logger.info(
+        f"Metadata ready in {time.perf_counter() - started:.2f}s "
+        f"({len(metadata_client.df)} series)"
+    )
+
+# Background warm-up started by lifespan(); tools wait for it instead of
+# loading the catalog and building a second index on the event loop.
+_warmup_task = None
+
+async def _metadata_ready():
+    """Wait for a running warm-up, then make sure the catalog is loaded."""
+    if _warmup_task is not None and not _warmup_task.done():
+        # shield: a cancelled tool call must not cancel the shared warm-up.
+        await asyncio.shield(_warmup_task)
+    await metadata_client.load()
+
+async def _cancel(task):
+    if task is None:
+        return
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+
+@asynccontextmanager
+async def lifespan(server):
+    """
+    Open the pooled BCRP HTTP client at startup and close it on shutdown,
+    warming up the metadata catalog according to ``BCRP_WARMUP`` and
+    refreshing it in the background while serving.
+    """
+    global _warmup_task
+    if WARMUP == "blocking":
+        await _warm_up()
+    elif WARMUP == "background":
+        _warmup_task = asyncio.create_task(_warm_up())
+    refresher = None
+    if METADATA_REFRESH_INTERVAL:
+        refresher = asyncio.create_task(
+            _refresh_metadata_periodically(METADATA_REFRESH_INTERVAL)
+        )
+    try:
+        async with bcrp_client:
+            yield
+    finally:
+        await _cancel(refresher)
+        await _cancel(_warmup_task)
+        _warmup_task = None
+
+# Initialize FastMCP
+mcp = FastMCP("bcrp-agent", lifespan=lifespan)
+
 # --- Internal Logic ---
 
 async def _search_series(query: str) -> str:
@@ -24,7 +134,7 @@ async def _search_series(query: str) -> str:
     Now returns deterministic result via SearchEngine.solve().
     """
     try:
-        await metadata_client.load()
+        await _metadata_ready()
         
         logger.info(f"Searching for: {query}")
         
@@ -33,11 +143,11 @@ async def _search_series(query: str) -> str:
         
         if "error" not in result:
             # Success - return JSON with the match
-            return json.dumps(result, ensure_ascii=False)
+            return fast_json.dumps(result)
         
         if result.get("error") == "ambiguedad":
             # Return ambiguity info for user to refine
-            return json.dumps(result, ensure_ascii=False)
+            return fast_json.dumps(result)
         
         # Fallback to fuzzy search for exploratory queries
         df = metadata_client.search(query)
@@ -49,7 +159,33 @@ async def _search_series(query: str) -> str:
         logger.error(f"Search failed: {e}")
         return f"Search failed: {str(e)}"
 
-async def _get_data(series_codes: list[str], period: str = None) -> str:
+async def _search_series_batch(queries: list[str]) -> str:
+    """
+    Resolve many queries in one pass via BCRPMetadata.solve_many().
+    Returns a JSON array with one solve()-shaped result per query.
+    """
+    try:
+        await _metadata_ready()
+
+        logger.info(f"Batch search for {len(queries)} queries")
+        results = metadata_client.solve_many(queries)
+        return fast_json.dumps(results)
+    except Exception as e:
+        logger.error(f"Batch search failed: {e}")
+        return f"Search failed: {str(e)}"
+
+@dataclass
+class DataResult:
+    """
+    Outcome of ``_fetch_data()``: the series frame, or why there is none.
+
+    Tools work on ``df`` directly and only serialize at the MCP boundary;
+    ``error`` holds the message returned to the caller verbatim.
+    """
+    df: Optional["pd.DataFrame"] = None
+    error: Optional[str] = None
+
+async def _fetch_data(series_codes: list[str], period: str = None) -> DataResult:
     try:
         logger.info(f"Fetching data for: {series_codes} range: {period}")
         
@@ -57,8 +193,6 @@ async def _get_data(series_codes: list[str], period: str = None) -> str:
         # We might need to handle the specific format "start_date/end_date" if provided as one string
         start = None
         end = None
-        start = None
-        end = None
         if period:
             parts = period.split('/')
             if len(parts) == 2:
@@ -80,12 +214,18 @@ async def _get_data(series_codes: list[str], period: str = None) -> str:
         df = await bcrp_client.get_series(series_codes, start_date=start, end_date=end)
         
         if df.empty:
-            return "No data found for the specified parameters."
+            return DataResult(error="No data found for the specified parameters.")
             
-        return df.to_json(orient='records', date_format='iso')
+        return DataResult(df=df)
     except Exception as e:
         logger.error(f"Fetch failed: {e}")
-        return f"Error fetching data: {str(e)}"
+        return DataResult(error=f"Error fetching data: {str(e)}")
+
+async def _get_data(series_codes: list[str], period: str = None) -> str:
+    result = await _fetch_data(series_codes, period)
+    if result.error:
+        return result.error
+    return result.df.to_json(orient='records', date_format='iso')
 
 # --- MCP Tools ---
 
@@ -106,6 +246,23 @@ async def search_series(query: str) -> str:
     """
     return await _search_series(query)
 
+@mcp.tool()
+async def search_series_batch(queries: list[str]) -> str:
+    """
+    Resolve many BCRP indicator names to series codes in one call.
+    
+    Use this instead of repeated `search_series` calls when mapping a list
+    of labels (e.g. spreadsheet headers) to BCRP codes.
+    
+    Args:
+        queries: Search terms (e.g., ["tipo de cambio venta", "inflacion"])
+    
+    Returns:
+        JSON array with one result per query, in order. Each result has the
+        same shape as a `search_series` match or ambiguity/no_match error.
+    """
+    return await _search_series_batch(queries)
+
 @mcp.tool()
 async def get_data(series_codes: list[str], period: str = None) -> str:
     """
@@ -140,23 +297,19 @@ async def get_table(
     """
     try:
         # 1. Fetch Data
-        data_json = await _get_data(series_codes, period)
-        if data_json.startswith("Error") or data_json.startswith("No data"):
-            return data_json
-            
-        import pandas as pd
-        df = pd.read_json(data_json, orient='records')
-        if df.empty:
-            return "No data found."
+        result = await _fetch_data(series_codes, period)
+        if result.error:
+            return result.error
+        df = result.df
             
         # 2. Resolve Names if not provided
         if not names:
-            await metadata_client.load()
+            await _metadata_ready()
             names = metadata_client.get_series_names(series_codes)
             
         # 3. Rename columns
         mapping = {code: name for code, name in zip(series_codes, names)}
-        df.rename(columns=mapping, inplace=True)
+        df = df.rename(columns=mapping)
             
         return df.to_json(orient='records', date_format='iso', indent=2)
         
@@ -185,14 +338,10 @@ async def plot_chart(
     """
     try:
         # 1. Fetch Data
-        data_json = await _get_data(series_codes, period)
-        if data_json.startswith("Error") or data_json.startswith("No data"):
-            return data_json
-            
-        import pandas as pd
-        df = pd.read_json(data_json, orient='records')
-        if df.empty:
-            return "No data found to plot."
+        result = await _fetch_data(series_codes, period)
+        if result.error:
+            return result.error
+        df = result.df
         
         # 2. Setup plot style
         import matplotlib
@@ -205,28 +354,11 @@ async def plot_chart(
         
         # 3. Parse time column (BCRP uses Spanish month abbreviations)
         if 'time' in df.columns:
-            # Spanish month mapping
-            spanish_months = {
-                'Ene': 'Jan', 'Feb': 'Feb', 'Mar': 'Mar', 'Abr': 'Apr',
-                'May': 'May', 'Jun': 'Jun', 'Jul': 'Jul', 'Ago': 'Aug',
-                'Sep': 'Sep', 'Oct': 'Oct', 'Nov': 'Nov', 'Dic': 'Dec'
-            }
-            
-            def parse_spanish_date(date_str):
-                """Convert BCRP Spanish date format to datetime."""
-                try:
-                    for es, en in spanish_months.items():
-                        date_str = date_str.replace(es, en)
-                    return pd.to_datetime(date_str, format='%b.%Y')
-                except Exception:
-                    return pd.to_datetime(date_str)
-            
-            df['time'] = df['time'].apply(parse_spanish_date)
-            df = df.set_index('time')
+            df = df.set_index(parse_period_labels(df['time']).rename('time')).drop(columns='time')
         
         # 4. Resolve Names if not provided
         if not names:
-            await metadata_client.load()
+            await _metadata_ready()
             names = metadata_client.get_series_names(series_codes)
 
         # 5. Plot each series
@@ -283,12 +415,12 @@ async def plot_chart(
         plt.close(fig)
         
         logger.info(f"Chart saved to: {save_path}")
-        return json.dumps({
+        return fast_json.dumps({
             "status": "success",
             "chart_path": save_path,
             "series": series_codes,
             "message": f"Chart saved to {save_path}"
-        }, ensure_ascii=False)
+        })
         
     except Exception as e:
         logger.error(f"Chart generation failed: {e}")
@@ -373,14 +505,15 @@ def get_metadata() -> str:
         # Resources are synchronous; a search or get operation loads metadata.
         # BCRPMetadata stores it in ``df`` (not ``data``).
         if not metadata_client._loaded or metadata_client.df.empty:
-            return json.dumps({"status": "Metadata not loaded. Run a search first to initialize."})
+            return fast_json.dumps({"status": "Metadata not loaded. Run a search first to initialize."})
 
         info = {
             "total_series": len(metadata_client.df),
             "columns": list(metadata_client.df.columns),
-            "memory_usage_mb": round(metadata_client.df.memory_usage(deep=True).sum() / 1e6, 2)
+            "memory_usage_mb": round(float(metadata_client.df.memory_usage(deep=True).sum()) / 1e6, 2),
+            "memory_report": metadata_client.memory_report,
         }
-        return json.dumps(info, indent=2)
+        return fast_json.dumps(info, indent=True)
     except Exception as e:
         return f"Error accessing metadata: {str(e)}"
 
@@ -394,7 +527,7 @@ def get_key_indicators() -> str:
         {"code": "PN01652XM", "name": "Precio del Cobre (c/lb)", "frequency": "Daily"},
         {"code": "PN00015MM", "name": "Reservas Internacionales Netas (Millones US$)", "frequency": "Monthly"}
     ]
-    return json.dumps(indicators, indent=2)
+    return fast_json.dumps(indicators, indent=True)
 
 @mcp.resource("bcrp://help")
 def get_help() -> str:
@@ -4,11 +4,45 @@ Basic tests for mcp-bcrp
 import pytest
 from mcp_bcrp.client import AsyncBCRPClient, BCRPMetadata
 from mcp_bcrp.search_engine import SearchEngine
+from mcp_bcrp import fast_json
 import pandas as pd
 import json
 import mcp_bcrp
 
 
+FIXTURE_CATALOG = pd.DataFrame({
+    "Código de serie": [
+        "PD04637PD", "PD04638PD", "PN01652XM", "PN01653XM", "PN01654XM",
+        "PN01270PM", "PN01271PM", "PN00015MM", "PN02000AM", "PN02001AM",
+        "PN03000MM", "PN03001MM", "PD38048AM", "PN01713AM",
+    ],
+    "Nombre de serie": [
+        "Tipo de cambio - TC Interbancario (S/ por US$) - Compra",
+        "Tipo de cambio - TC Interbancario (S/ por US$) - Venta",
+        "Cotizaciones internacionales - Cobre - LME (cUS$ por libras)",
+        "Cotizaciones internacionales - Cobre - LME (var. %)",
+        "Cotizaciones internacionales - Oro - LME (US$ por onzas troy)",
+        "Índice de precios Lima Metropolitana (var. % mensual) - IPC",
+        "Índice de precios Lima Metropolitana (índice 2009 = 100)",
+        "Reservas internacionales netas (millones US$)",
+        "Exportaciones tradicionales - Mineras",
+        "Exportaciones no tradicionales - Textiles",
+        "Crédito al sector privado - Soles",
+        "Crédito al sector privado - Dólares",
+        "Expectativas empresariales - PBI a 12 meses",
+        "PBI agropecuario (var. %)",
+    ],
+})
+
+RECALL_QUERIES = [
+    "tipo de cambio venta", "tc compra", "precio del cobre", "cobre lme",
+    "oro internacional", "inflacion lima", "ipc", "reservas internacionales",
+    "exportacion minera", "credito sector privado dolares",
+    "expectativas pbi", "pbi agropecuario", "indice precios", "zzz",
+    "exportaciones",
+]
+
+
 class TestSearchEngine:
     """Test the deterministic search engine."""
     
@@ -40,6 +74,120 @@ class TestSearchEngine:
         attrs = engine._extract_attributes("credito soles")
         assert attrs["currency"] == "pen"
 
+    def test_vectorized_corpus_matches_rowwise_normalization(self):
+        """The column-wise corpus must equal _normalize/_extract_attributes per row."""
+        names = [
+            "Tipo de cambio - TC Interbancario (S/ por US$) - Compra",
+            "T.C. venta",
+            "Precio internacional del oro",
+            "Índice   de la  Producción\tLIMA - etc",
+            "Crédito de largo plazo en soles",
+            "Crédito de largo plazo en soles",
+            "PBI minería (var. %)",
+            "",
+        ]
+        df = pd.DataFrame({
+            "Código de serie": [f"TEST{i:03d}" for i in range(len(names))],
+            "Nombre de serie": names,
+        })
+        engine = SearchEngine(df)
+        corpus = engine.search_corpus
+
+        assert list(corpus["idx"]) == list(df.index)
+        assert list(corpus["codigo_serie"]) == list(df["Código de serie"])
+        for name, (_, item) in zip(names, corpus.iterrows()):
+            expected_norm = engine._normalize(name)
+            expected_attrs = engine._extract_attributes(expected_norm)
+            assert item["name_norm"] == expected_norm
+            for attr in ("currency", "side", "horizon"):
+                value = None if pd.isna(item[attr]) else item[attr]
+                assert value == expected_attrs[attr]
+        assert isinstance(corpus["side"].dtype, pd.CategoricalDtype)
+
+    def test_batched_scores_match_per_entry_scoring(self):
+        """cdist scoring plus the vectorized side boost equals the scalar rules."""
+        from rapidfuzz import fuzz
+
+        df = pd.DataFrame({
+            "Código de serie": ["PD04637PD", "PD04638PD", "PN01652XM"],
+            "Nombre de serie": [
+                "Tipo de cambio interbancario compra",
+                "Tipo de cambio interbancario venta",
+                "Precio del cobre",
+            ],
+        })
+        engine = SearchEngine(df)
+        q_norm = engine._normalize("tipo de cambio venta")
+        scores = engine._score([q_norm], [engine._extract_attributes(q_norm)])[0]
+
+        expected = [fuzz.token_set_ratio(q_norm, n) for n in engine._names_norm]
+        expected[0] -= 10  # opposite side
+        expected[1] += 5   # matching side
+        assert scores.tolist() == pytest.approx(expected)
+
+    def test_solve_many_matches_solve(self):
+        """Batch resolution returns, per query and in order, what solve() returns."""
+        df = pd.DataFrame({
+            "Código de serie": ["PD04637PD", "PD04638PD", "PN01652XM", "PN01653XM"],
+            "Nombre de serie": [
+                "Tipo de cambio interbancario compra",
+                "Tipo de cambio interbancario venta",
+                "Precio del cobre",
+                "Precio del cobre (var. %)",
+            ],
+        })
+        engine = SearchEngine(df)
+        engine.BATCH_SIZE = 2
+        queries = [
+            "tipo de cambio venta", "", "precio cobre", "TC compra",
+            "tipo de cambio venta", "zzz",
+        ]
+
+        results = engine.solve_many(queries)
+
+        assert results == [engine.solve(q) for q in queries]
+        assert results[0]["codigo_serie"] == "PD04638PD"
+        assert results[1]["reason"] == "empty_query"
+        assert results[3]["codigo_serie"] == "PD04637PD"
+
+
+class TestTokenIndex:
+    """Inverted-index shortlisting must not change search results."""
+
+    @pytest.mark.parametrize("query", RECALL_QUERIES)
+    def test_indexed_results_match_full_scan(self, query):
+        full_scan = SearchEngine(FIXTURE_CATALOG, use_index=False)
+        indexed = SearchEngine(FIXTURE_CATALOG, min_candidates=1)
+
+        assert indexed.solve(query) == full_scan.solve(query)
+
+    def test_shortlist_prunes_unrelated_series(self):
+        engine = SearchEngine(FIXTURE_CATALOG, min_candidates=1)
+
+        shortlist = engine._shortlist(engine._normalize("precio del cobre"))
+
+        assert shortlist is not None
+        codes = {engine._codes[i] for i in shortlist}
+        assert {"PN01652XM", "PN01653XM"} <= codes
+        assert "PD04638PD" not in codes
+
+    def test_index_keys_on_token_prefix(self):
+        """Plural variants share a posting list ("exportacion"/"exportaciones")."""
+        engine = SearchEngine(FIXTURE_CATALOG, min_candidates=1)
+
+        shortlist = engine._shortlist(engine._normalize("exportacion"))
+
+        assert {engine._codes[i] for i in shortlist} == {"PN02000AM", "PN02001AM"}
+
+    def test_small_shortlist_falls_back_to_full_scan(self):
+        engine = SearchEngine(FIXTURE_CATALOG, min_candidates=5)
+
+        # A misspelling shares no token with the catalog, so nothing is shortlisted.
+        assert engine._shortlist(engine._normalize("rservas")) is None
+        assert engine._shortlist(engine._normalize("exportacion")) is None
+        full_scan = SearchEngine(FIXTURE_CATALOG, use_index=False)
+        assert engine.solve("rservas") == full_scan.solve("rservas")
+
 
 class TestBCRPMetadata:
     """Test metadata loading and search."""
@@ -61,6 +209,387 @@ class TestBCRPMetadata:
         assert metadata._loaded is True
         assert metadata.df.to_dict(orient="records") == frame.to_dict(orient="records")
 
+    @pytest.mark.asyncio
+    async def test_load_reads_cache_off_the_event_loop(self, tmp_path):
+        """The blocking cache read runs in a worker thread."""
+        import threading
+
+        cache_path = tmp_path / "bcrp_metadata.json"
+        pd.DataFrame({"Código de serie": ["TEST001"]}).to_json(cache_path, orient="records")
+        metadata = BCRPMetadata()
+        metadata._cache_path = cache_path
+        read_cache = metadata._load_cache
+        threads = []
+
+        def load_cache():
+            threads.append(threading.current_thread())
+            return read_cache()
+
+        metadata._load_cache = load_cache
+        await metadata.load()
+
+        assert threads and threads[0] is not threading.main_thread()
+        assert metadata._loaded is True
+
+    @pytest.mark.asyncio
+    async def test_json_cache_migrates_to_feather(self, tmp_path):
+        """An existing JSON cache is rewritten as Feather and then preferred."""
+        pytest.importorskip("pyarrow")
+        frame = pd.DataFrame({
+            "Código de serie": ["TEST001", "TEST002"],
+            "Nombre de serie": ["Precio del Cobre", "Precio del Oro"],
+        })
+        cache_path = tmp_path / "bcrp_metadata.json"
+        frame.to_json(cache_path, orient="records")
+
+        metadata = BCRPMetadata()
+        metadata._cache_path = cache_path
+        await metadata.load()
+
+        assert not cache_path.exists()
+        assert metadata._binary_cache_path.exists()
+
+        reloaded = BCRPMetadata()
+        reloaded._cache_path = cache_path
+        await reloaded.load()
+        assert reloaded.df.to_dict(orient="records") == frame.to_dict(orient="records")
+
+    @pytest.mark.asyncio
+    async def test_feather_cache_is_memory_mapped(self, tmp_path):
+        """Loaded columns stay Arrow-backed and survive a cache rewrite."""
+        pytest.importorskip("pyarrow")
+        frame = pd.DataFrame({
+            "Código de serie": ["TEST001", "TEST002"],
+            "Nombre de serie": ["Precio del Cobre", "Precio del Oro"],
+        })
+        metadata = BCRPMetadata()
+        metadata._cache_path = tmp_path / "bcrp_metadata.json"
+        metadata._write_cache(frame)
+        await metadata.load()
+
+        assert "Arrow" in type(metadata.df["Nombre de serie"].array).__name__
+        assert metadata.df["Nombre de serie"].dtype.storage == "pyarrow"
+
+        # Another process refreshing the cache replaces the file, it must
+        # not truncate the pages this one has mapped.
+        metadata._write_cache(frame.iloc[:1])
+        assert metadata.df["Nombre de serie"].tolist() == ["Precio del Cobre", "Precio del Oro"]
+        assert list(tmp_path.iterdir()) == [metadata._binary_cache_path]
+
+    @pytest.mark.asyncio
+    async def test_failed_feather_write_does_not_shadow_json(self, tmp_path, monkeypatch):
+        """If Feather cannot be replaced, the old file must not win on load."""
+        pytest.importorskip("pyarrow")
+        import os
+        import mcp_bcrp.client as client_module
+
+        metadata = BCRPMetadata()
+        metadata._cache_path = tmp_path / "bcrp_metadata.json"
+        metadata._write_cache(pd.DataFrame({
+            "Código de serie": ["OLD001"],
+            "Nombre de serie": ["Catalogo anterior"],
+        }))
+
+        real_replace = os.replace
+
+        def replace(src, dst):
+            if str(dst).endswith(".feather"):
+                raise PermissionError("file is mapped")
+            real_replace(src, dst)
+
+        monkeypatch.setattr(client_module.os, "replace", replace)
+        metadata._write_cache(pd.DataFrame({
+            "Código de serie": ["NEW001"],
+            "Nombre de serie": ["Catalogo nuevo"],
+        }))
+        monkeypatch.undo()
+
+        assert not metadata._binary_cache_path.exists()
+        reloaded = BCRPMetadata()
+        reloaded._cache_path = metadata._cache_path
+        await reloaded.load()
+        assert reloaded.df["Código de serie"].tolist() == ["NEW001"]
+
+    @pytest.mark.asyncio
+    async def test_undeletable_feather_is_skipped_as_older(self, tmp_path, monkeypatch):
+        """A mapped Feather file that cannot be removed loses to newer JSON."""
+        pytest.importorskip("pyarrow")
+        import os
+        from pathlib import Path
+        import mcp_bcrp.client as client_module
+
+        metadata = BCRPMetadata()
+        metadata._cache_path = tmp_path / "bcrp_metadata.json"
+        metadata._write_cache(pd.DataFrame({
+            "Código de serie": ["OLD001"],
+            "Nombre de serie": ["Catalogo anterior"],
+        }))
+        written = metadata._binary_cache_path.stat().st_mtime
+        os.utime(metadata._binary_cache_path, (written - 60, written - 60))
+
+        real_replace, real_unlink = os.replace, Path.unlink
+
+        def replace(src, dst):
+            if str(dst).endswith(".feather"):
+                raise PermissionError("file is mapped")
+            real_replace(src, dst)
+
+        def unlink(path, missing_ok=False):
+            if path.suffix == ".feather":
+                raise PermissionError("file is mapped")
+            real_unlink(path, missing_ok=missing_ok)
+
+        monkeypatch.setattr(client_module.os, "replace", replace)
+        monkeypatch.setattr(Path, "unlink", unlink)
+        metadata._write_cache(pd.DataFrame({
+            "Código de serie": ["NEW001"],
+            "Nombre de serie": ["Catalogo nuevo"],
+        }))
+        monkeypatch.undo()
+
+        assert metadata._binary_cache_path.exists()
+        assert metadata._cache_path.exists()
+        reloaded = BCRPMetadata()
+        reloaded._cache_path = metadata._cache_path
+        await reloaded.load()
+        assert reloaded.df["Código de serie"].tolist() == ["NEW001"]
+
+    @pytest.mark.asyncio
+    async def test_cache_falls_back_to_json_without_pyarrow(self, tmp_path, monkeypatch):
+        """Without pyarrow the catalog is still cached and reloaded as JSON."""
+        import mcp_bcrp.client as client_module
+
+        monkeypatch.setattr(client_module, "_pyarrow_available", lambda: False)
+        frame = pd.DataFrame({
+            "Código de serie": ["TEST001"],
+            "Nombre de serie": ["Precio del Cobre"],
+        })
+
+        metadata = BCRPMetadata()
+        metadata._cache_path = tmp_path / "bcrp_metadata.json"
+        metadata._write_cache(frame)
+        assert metadata._cache_path.exists()
+        assert not metadata._binary_cache_path.exists()
+
+        reloaded = BCRPMetadata()
+        reloaded._cache_path = metadata._cache_path
+        await reloaded.load()
+        assert reloaded.df.to_dict(orient="records") == frame.to_dict(orient="records")
+
+    def test_repetitive_columns_become_categorical(self):
+        """Low-cardinality columns are compacted; codes and names are not."""
+        metadata = BCRPMetadata()
+        metadata._set_df(pd.DataFrame({
+            "Código de serie": [f"PN{i:05d}MM" for i in range(6)],
+            "Nombre de serie": ["Precio del cobre"] * 6,
+            "Frecuencia": ["Mensual", "Diaria"] * 3,
+            "Fuente": ["BCRP"] * 6,
+        }))
+
+        assert metadata._memory_report == {"categorical_columns": ["Frecuencia", "Fuente"]}
+        assert metadata.memory_report["categorical_columns"] == ["Frecuencia", "Fuente"]
+        assert metadata.memory_report["after_mb"] <= metadata.memory_report["before_mb"]
+        assert not isinstance(metadata.df["Nombre de serie"].dtype, pd.CategoricalDtype)
+        assert metadata.df["Frecuencia"].tolist() == ["Mensual", "Diaria"] * 3
+
+    def test_simple_search_filters_categorical_columns(self):
+        """The fallback search matches categorical and plain columns alike."""
+        metadata = BCRPMetadata()
+        metadata.df = pd.DataFrame({
+            "Código de serie": ["PN01652XM", "PN01653XM", "PD04638PD"],
+            "Nombre de serie": pd.Categorical(
+                ["Cobre - LME", "Cobre - LME (var. %)", "Tipo de cambio"]
+            ),
+        })
+
+        assert metadata._simple_search("COBRE var")["Código de serie"].tolist() == ["PN01653XM"]
+        assert metadata._simple_search("pd046")["Código de serie"].tolist() == ["PD04638PD"]
+
+    def test_solve_reuses_search_engine(self):
+        """The search index is built once per catalog, not once per query."""
+        metadata = BCRPMetadata()
+        metadata.df = pd.DataFrame({
+            "Código de serie": ["PD04637PD", "PD04638PD"],
+            "Nombre de serie": [
+                "Tipo de cambio interbancario compra",
+                "Tipo de cambio interbancario venta",
+            ],
+        })
+
+        assert metadata.solve("tipo de cambio venta")["codigo_serie"] == "PD04638PD"
+        engine = metadata._engine
+        metadata.solve("tipo de cambio compra")
+        assert metadata._engine is engine
+
+    @pytest.mark.asyncio
+    async def test_refresh_swaps_in_prebuilt_search_engine(self, tmp_path, mock_httpx):
+        """refresh() installs an engine for the new catalog, built off the loop."""
+        import httpx
+
+        csv = "Código de serie;Nombre de serie\nPN00001XM;Precio del oro\n"
+
+        def handler(request):
+            return httpx.Response(200, content=csv.encode("latin-1"))
+
+        mock_httpx(handler)
+
+        metadata = BCRPMetadata()
+        metadata._cache_path = tmp_path / "bcrp_metadata.json"
+        metadata.df = pd.DataFrame({
+            "Código de serie": ["TEST001"],
+            "Nombre de serie": ["Precio del cobre"],
+        })
+        metadata.solve("precio del cobre")
+        stale = metadata._engine
+
+        await metadata.refresh()
+
+        engine = metadata._engine
+        assert engine is not stale
+        assert engine is not None and engine.df is metadata.df
+        assert metadata.solve("precio del oro")["codigo_serie"] == "PN00001XM"
+        assert metadata._engine is engine
+
+
+    @pytest.mark.asyncio
+    async def test_refresh_streams_and_parses_in_chunks(self, tmp_path, mock_httpx):
+        """A multi-chunk download parses to the same catalog as one read."""
+        import httpx
+
+        rows = [f"PN{i:05d}MM;Serie {i};Mensual" for i in range(25)]
+        csv = "Código de serie;Nombre de serie;Frecuencia\n" + "\n".join(rows) + "\n"
+
+        async def body():
+            data = csv.encode("latin-1")
+            for start in range(0, len(data), 64):
+                yield data[start:start + 64]
+
+        def handler(request):
+            return httpx.Response(200, content=body())
+
+        mock_httpx(handler)
+
+        metadata = BCRPMetadata()
+        metadata.CSV_CHUNK_ROWS = 10
+        metadata._cache_path = tmp_path / "bcrp_metadata.json"
+        await metadata.refresh()
+
+        assert len(metadata.df) == 25
+        assert metadata.df["Código de serie"].iloc[-1] == "PN00024MM"
+        assert metadata.df["Nombre de serie"].iloc[3] == "Serie 3"
+        assert not list(tmp_path.glob("*.part"))
+
+    @pytest.mark.asyncio
+    async def test_failed_refresh_keeps_existing_cache(self, tmp_path, mock_httpx):
+        """An interrupted download leaves the catalog and its cache untouched."""
+        import httpx
+
+        async def body():
+            yield "Código de serie;Nombre de serie\nPN0".encode("latin-1")
+            raise httpx.ReadError("connection reset")
+
+        def handler(request):
+            return httpx.Response(200, content=body())
+
+        mock_httpx(handler)
+
+        frame = pd.DataFrame({
+            "Código de serie": ["TEST001"],
+            "Nombre de serie": ["Precio del Cobre"],
+        })
+        metadata = BCRPMetadata()
+        metadata._cache_path = tmp_path / "bcrp_metadata.json"
+        metadata._write_cache(frame)
+        await metadata.load()
+        cached = sorted(p.name for p in tmp_path.iterdir())
+
+        with pytest.raises(httpx.ReadError):
+            await metadata.refresh()
+
+        assert metadata.df["Código de serie"].tolist() == ["TEST001"]
+        assert sorted(p.name for p in tmp_path.iterdir()) == cached
+
+
+    @pytest.mark.asyncio
+    async def test_refresh_is_conditional_on_validators(self, tmp_path, monkeypatch, mock_httpx):
+        """A 304 keeps the cached catalog without downloading or parsing."""
+        import httpx
+
+        csv = "Código de serie;Nombre de serie\nPN00001XM;Precio del oro\n"
+        seen = []
+
+        def handler(request):
+            seen.append(request.headers.get("If-None-Match"))
+            if request.headers.get("If-None-Match") == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(200, content=csv.encode("latin-1"), headers={"ETag": '"v1"'})
+
+        mock_httpx(handler)
+
+        metadata = BCRPMetadata()
+        metadata._cache_path = tmp_path / "bcrp_metadata.json"
+        await metadata.refresh()
+        assert metadata._read_validators()["etag"] == '"v1"'
+
+        reloaded = BCRPMetadata()
+        reloaded._cache_path = metadata._cache_path
+        monkeypatch.setattr(reloaded, "_parse_csv", lambda path: pytest.fail("parsed on 304"))
+        await reloaded.refresh()
+
+        assert seen == [None, '"v1"']
+        assert reloaded.df["Código de serie"].tolist() == ["PN00001XM"]
+
+    @pytest.mark.asyncio
+    async def test_refresh_skips_parse_when_content_hash_matches(self, tmp_path, monkeypatch, mock_httpx):
+        """Without ETag/Last-Modified, an identical body is not re-parsed."""
+        import httpx
+
+        csv = "Código de serie;Nombre de serie\nPN00001XM;Precio del oro\n"
+
+        def handler(request):
+            return httpx.Response(200, content=csv.encode("latin-1"))
+
+        mock_httpx(handler)
+
+        metadata = BCRPMetadata()
+        metadata._cache_path = tmp_path / "bcrp_metadata.json"
+        await metadata.refresh()
+        catalog = metadata.df
+
+        monkeypatch.setattr(metadata, "_parse_csv", lambda path: pytest.fail("parsed twice"))
+        await metadata.refresh()
+
+        assert metadata.df is catalog
+
+    @pytest.mark.asyncio
+    async def test_stale_cache_is_served_while_revalidating(self, tmp_path, mock_httpx):
+        """load() answers from a stale cache and swaps in the new catalog later."""
+        import httpx
+
+        csv = "Código de serie;Nombre de serie\nPN00001XM;Precio del oro\n"
+
+        def handler(request):
+            return httpx.Response(200, content=csv.encode("latin-1"))
+
+        mock_httpx(handler)
+
+        clock = FakeClock()
+        metadata = BCRPMetadata(max_age=3600, clock=clock)
+        metadata._cache_path = tmp_path / "bcrp_metadata.json"
+        metadata._write_cache(pd.DataFrame({
+            "Código de serie": ["TEST001"],
+            "Nombre de serie": ["Precio del cobre"],
+        }))
+        metadata._write_validators({"checked_at": clock()})
+        clock.now += 7200
+
+        await metadata.load()
+
+        assert metadata.df["Código de serie"].tolist() == ["TEST001"]
+        await metadata._revalidation
+        assert metadata.df["Código de serie"].tolist() == ["PN00001XM"]
+        assert metadata._read_validators()["checked_at"] == clock()
+
 
 class TestServerResources:
     """Regression tests for synchronous MCP resources."""
@@ -90,6 +619,676 @@ class TestServerResources:
         assert payload["status"].startswith("Metadata not loaded")
 
 
+class TestServerTools:
+    """Tests for MCP tool helpers that do not hit the network."""
+
+    @pytest.mark.asyncio
+    async def test_search_series_batch_returns_one_result_per_query(self, monkeypatch):
+        import mcp_bcrp.server as server
+
+        frame = pd.DataFrame({
+            "Código de serie": ["PD04637PD", "PD04638PD"],
+            "Nombre de serie": [
+                "Tipo de cambio interbancario compra",
+                "Tipo de cambio interbancario venta",
+            ],
+        })
+        monkeypatch.setattr(server.metadata_client, "df", frame)
+        monkeypatch.setattr(server.metadata_client, "_loaded", True)
+
+        payload = json.loads(await server._search_series_batch(
+            ["tipo de cambio venta", "", "tc compra"]
+        ))
+
+        assert [r.get("codigo_serie") for r in payload] == ["PD04638PD", None, "PD04637PD"]
+        assert payload[1]["reason"] == "empty_query"
+
+    @pytest.mark.asyncio
+    async def test_get_table_uses_frame_without_json_round_trip(self, monkeypatch):
+        """get_table renames the fetched frame directly; JSON happens once."""
+        import mcp_bcrp.server as server
+
+        async def get_series(codes, start_date=None, end_date=None):
+            return pd.DataFrame({"time": ["Ene.2024", "Feb.2024"], "PN01652XM": [3.5, None]})
+
+        monkeypatch.setattr(server.bcrp_client, "get_series", get_series)
+        monkeypatch.setattr(pd, "read_json", lambda *a, **k: pytest.fail("JSON round trip"))
+
+        payload = json.loads(await server.get_table(["PN01652XM"], names=["Cobre"]))
+
+        assert payload == [
+            {"time": "Ene.2024", "Cobre": 3.5},
+            {"time": "Feb.2024", "Cobre": None},
+        ]
+
+    @pytest.mark.asyncio
+    async def test_data_errors_are_returned_verbatim(self, monkeypatch):
+        import mcp_bcrp.server as server
+
+        async def get_series(codes, start_date=None, end_date=None):
+            raise RuntimeError("timeout")
+
+        monkeypatch.setattr(server.bcrp_client, "get_series", get_series)
+
+        result = await server._fetch_data(["PN01652XM"])
+        assert result.df is None
+        assert result.error == "Error fetching data: timeout"
+        assert await server.get_table(["PN01652XM"]) == result.error
+        assert await server.get_data(["PN01652XM"]) == result.error
+
+    @pytest.mark.asyncio
+    async def test_scheduled_refresh_survives_failures(self, monkeypatch):
+        """The refresh loop ticks at the interval and logs, not raises, errors."""
+        import asyncio
+        import mcp_bcrp.server as server
+
+        calls = []
+
+        async def refresh():
+            calls.append(len(calls))
+            if len(calls) == 1:
+                raise RuntimeError("BCRP down")
+
+        async def sleep(seconds):
+            sleeps.append(seconds)
+            if len(sleeps) > 3:
+                raise asyncio.CancelledError
+
+        sleeps = []
+        monkeypatch.setattr(server.metadata_client, "refresh", refresh)
+
+        with pytest.raises(asyncio.CancelledError):
+            await server._refresh_metadata_periodically(60, sleep=sleep)
+
+        assert sleeps == [60, 60, 60, 60]
+        assert calls == [0, 1, 2]
+
+    @pytest.mark.asyncio
+    async def test_lifespan_stops_scheduled_refresh(self, monkeypatch):
+        import asyncio
+        import mcp_bcrp.server as server
+
+        monkeypatch.setattr(server, "METADATA_REFRESH_INTERVAL", 3600)
+        monkeypatch.setattr(server, "WARMUP", "off")
+        before = asyncio.all_tasks()
+        async with server.lifespan(server.mcp):
+            refreshers = asyncio.all_tasks() - before
+            assert len(refreshers) == 1
+        (refresher,) = refreshers
+        assert refresher.cancelled()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("mode", ["blocking", "background"])
+    async def test_lifespan_warms_up_metadata(self, monkeypatch, caplog, mode):
+        """Warm-up loads the catalog and builds the index before first use."""
+        import asyncio
+        import logging
+        import mcp_bcrp.server as server
+
+        async def load():
+            server.metadata_client.df = FIXTURE_CATALOG
+            server.metadata_client._loaded = True
+
+        monkeypatch.setattr(server.metadata_client, "df", pd.DataFrame())
+        monkeypatch.setattr(server.metadata_client, "_loaded", False)
+        monkeypatch.setattr(server.metadata_client, "_engine", None)
+        monkeypatch.setattr(server.metadata_client, "load", load)
+        monkeypatch.setattr(server, "METADATA_REFRESH_INTERVAL", 0)
+        monkeypatch.setattr(server, "WARMUP", mode)
+
+        with caplog.at_level(logging.INFO, logger="mcp_bcrp"):
+            async with server.lifespan(server.mcp):
+                if mode == "blocking":
+                    assert server.metadata_client._engine is not None
+                else:
+                    for _ in range(100):
+                        if server.metadata_client._engine is not None:
+                            break
+                        await asyncio.sleep(0.01)
+
+        assert server.metadata_client._engine.df is FIXTURE_CATALOG
+        assert "Metadata ready in" in caplog.text
+
+    @pytest.mark.asyncio
+    async def test_search_during_warmup_reuses_its_engine(self, monkeypatch):
+        """A tool call racing the background warm-up waits for its index."""
+        import mcp_bcrp.search_engine as search_engine
+        import mcp_bcrp.server as server
+
+        builds = []
+
+        class CountingEngine(search_engine.SearchEngine):
+            def __init__(self, *args, **kwargs):
+                builds.append(1)
+                super().__init__(*args, **kwargs)
+
+        async def load():
+            server.metadata_client.df = FIXTURE_CATALOG
+            server.metadata_client._loaded = True
+
+        monkeypatch.setattr(search_engine, "SearchEngine", CountingEngine)
+        monkeypatch.setattr(server.metadata_client, "df", pd.DataFrame())
+        monkeypatch.setattr(server.metadata_client, "_loaded", False)
+        monkeypatch.setattr(server.metadata_client, "_engine", None)
+        monkeypatch.setattr(server.metadata_client, "load", load)
+        monkeypatch.setattr(server, "METADATA_REFRESH_INTERVAL", 0)
+        monkeypatch.setattr(server, "WARMUP", "background")
+
+        async with server.lifespan(server.mcp):
+            # Issued before the warm-up task has had a chance to run.
+            payload = json.loads(await server._search_series("tipo de cambio venta"))
+
+        assert payload["codigo_serie"] == "PD04638PD"
+        assert builds == [1]
+        assert server._warmup_task is None
+
+    def test_invalid_warmup_mode_falls_back(self, monkeypatch):
+        import mcp_bcrp.server as server
+
+        monkeypatch.setenv("BCRP_WARMUP", "eager")
+        assert server._warmup_mode_from_env() == "background"
+        monkeypatch.setenv("BCRP_WARMUP", "OFF")
+        assert server._warmup_mode_from_env() == "off"
+
+
+class FakeClock:
+    """Manual clock: sleeping advances time instantly and is recorded."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TestTokenBucket:
+    """Rate limiting is expressed as tokens per second, tested with a fake clock."""
+
+    @pytest.mark.asyncio
+    async def test_requests_are_spaced_at_the_configured_rate(self):
+        from mcp_bcrp.rate_limit import TokenBucket
+
+        clock = FakeClock()
+        bucket = TokenBucket(rate=4.0, burst=1, clock=clock, sleep=clock.sleep)
+
+        for _ in range(3):
+            await bucket.acquire()
+
+        assert clock.sleeps == pytest.approx([0.25, 0.25])
+        assert clock.now == pytest.approx(0.5)
+
+    @pytest.mark.asyncio
+    async def test_burst_is_served_immediately_then_refills(self):
+        from mcp_bcrp.rate_limit import TokenBucket
+
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2.0, burst=3, clock=clock, sleep=clock.sleep)
+
+        for _ in range(3):
+            await bucket.acquire()
+        assert clock.sleeps == []
+
+        await bucket.acquire()
+        assert clock.sleeps == pytest.approx([0.5])
+
+        clock.now += 10  # idle time refills at most `burst` tokens
+        for _ in range(3):
+            await bucket.acquire()
+        assert clock.sleeps == pytest.approx([0.5])
+
+    @pytest.mark.asyncio
+    async def test_zero_rate_disables_limiting(self):
+        from mcp_bcrp.rate_limit import TokenBucket
+
+        clock = FakeClock()
+        bucket = TokenBucket(rate=0, clock=clock, sleep=clock.sleep)
+        for _ in range(10):
+            await bucket.acquire()
+        assert clock.sleeps == []
+
+
+@pytest.fixture
+def mock_httpx(monkeypatch):
+    """
+    Install ``handler(request)`` as the transport of every httpx.AsyncClient
+    created from then on. Returns the list of clients created.
+    """
+    import httpx
+
+    real_client = httpx.AsyncClient
+
+    def install(handler):
+        created = []
+
+        def factory(**kwargs):
+            created.append(real_client(transport=httpx.MockTransport(handler), **kwargs))
+            return created[-1]
+
+        monkeypatch.setattr(httpx, "AsyncClient", factory)
+        return created
+
+    return install
+
+
+def bcrp_api(mock_httpx, responder):
+    """
+    Route AsyncBCRPClient HTTP calls to ``responder(codes, start, end)``.
+    Returns the list of requested URL paths.
+    """
+    import httpx
+
+    requested = []
+
+    def handler(request):
+        requested.append(request.url.path)
+        parts = request.url.path.split("/api/")[1].split("/")
+        codes = parts[0].split("-")
+        start, end = (parts[2], parts[3]) if len(parts) >= 4 else (None, None)
+        return httpx.Response(200, json=responder(codes, start, end))
+
+    mock_httpx(handler)
+    return requested
+
+
+def monthly_payload(codes, start, end):
+    """Three months of data, value = code index + month number."""
+    return {"periods": [
+        {"name": label, "values": [str(i + m) for i in range(len(codes))]}
+        for m, label in enumerate(["Ene.2024", "Feb.2024", "Mar.2024"], start=1)
+    ]}
+
+
+class TestSeriesCache:
+    """Fetched observations are cached per code, frequency and period."""
+
+    @pytest.mark.asyncio
+    async def test_repeat_request_is_served_from_cache(self, tmp_path, mock_httpx):
+        from mcp_bcrp.cache import SeriesCache
+
+        requested = bcrp_api(mock_httpx, monthly_payload)
+        client = AsyncBCRPClient(rate_limit=0, cache=SeriesCache(tmp_path))
+
+        first = await client.get_series(["PN01270PM", "PN01271PM"], "2024-01", "2024-03")
+        second = await client.get_series(["PN01270PM", "PN01271PM"], "2024-01", "2024-03")
+        await client.aclose()
+
+        assert len(requested) == 1
+        pd.testing.assert_frame_equal(first, second)
+        assert list(second.columns) == ["time", "PN01270PM", "PN01271PM"]
+
+    @pytest.mark.asyncio
+    async def test_only_uncached_codes_are_fetched(self, tmp_path, mock_httpx):
+        from mcp_bcrp.cache import SeriesCache
+
+        requested = bcrp_api(mock_httpx, monthly_payload)
+        client = AsyncBCRPClient(rate_limit=0, cache=SeriesCache(tmp_path))
+
+        await client.get_series(["PN01271PM"], "2024-01", "2024-03")
+        df = await client.get_series(["PN01270PM", "PN01271PM"], "2024-01", "2024-03")
+        await client.aclose()
+
+        assert requested[-1].endswith("/PN01270PM/json/2024-1/2024-3")
+        assert list(df.columns) == ["time", "PN01270PM", "PN01271PM"]
+        assert df["PN01271PM"].tolist() == [1.0, 2.0, 3.0]
+
+    @pytest.mark.asyncio
+    async def test_stale_entry_fetches_only_the_missing_tail(self, tmp_path, mock_httpx):
+        from mcp_bcrp.cache import SeriesCache
+
+        clock = FakeClock()
+        cache = SeriesCache(tmp_path, clock=clock)
+        cache.put("PD04638PD", "daily", "2024-1-2", "2024-1-5",
+                  ["02.Ene.24", "03.Ene.24"], [3.70, 3.71])
+        clock.now += 7 * 3600  # past the daily TTL
+
+        def responder(codes, start, end):
+            return {"periods": [
+                {"name": "03.Ene.24", "values": ["3.72"]},  # revised
+                {"name": "04.Ene.24", "values": ["3.73"]},
+                {"name": "05.Ene.24", "values": ["n.d."]},
+            ]}
+
+        requested = bcrp_api(mock_httpx, responder)
+        client = AsyncBCRPClient(rate_limit=0, cache=cache)
+        df = await client.get_series(["PD04638PD"], "2024-01-02", "2024-01-05")
+        await client.aclose()
+
+        assert requested == ["/estadisticas/series/api/PD04638PD/json/2024-1-3/2024-1-5"]
+        assert df["time"].tolist() == ["02.Ene.24", "03.Ene.24", "04.Ene.24", "05.Ene.24"]
+        assert df["PD04638PD"].tolist()[:3] == [3.70, 3.72, 3.73]
+        assert pd.isna(df["PD04638PD"].iloc[3])
+
+        entry = cache.get("PD04638PD", "daily", "2024-1-2", "2024-1-5")
+        assert entry["time"][-1] == "05.Ene.24"
+        assert entry["values"][-1] is None
+
+    @pytest.mark.asyncio
+    async def test_duplicated_codes_are_fetched_once(self, tmp_path, mock_httpx):
+        from mcp_bcrp.cache import SeriesCache
+
+        requested = bcrp_api(mock_httpx, monthly_payload)
+        client = AsyncBCRPClient(rate_limit=0, cache=SeriesCache(tmp_path))
+
+        df = await client.get_series(["PN01270PM", "PN01270PM"], "2024-01", "2024-03")
+        await client.aclose()
+
+        assert requested == ["/estadisticas/series/api/PN01270PM/json/2024-1/2024-3"]
+        assert list(df.columns) == ["time", "PN01270PM"]
+        assert df["PN01270PM"].tolist() == [1.0, 2.0, 3.0]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("code, frequency, labels, tail_start", [
+        ("PN38063GQ", "quarterly", ["T2.24", "T3.24"], "2024-3"),
+        ("PM04960AA", "annual", ["2023", "2024"], "2024"),
+    ])
+    async def test_tail_start_uses_the_frequency_format(
+        self, tmp_path, mock_httpx, code, frequency, labels, tail_start
+    ):
+        from mcp_bcrp.cache import SeriesCache
+
+        clock = FakeClock()
+        cache = SeriesCache(tmp_path, clock=clock)
+        cache.put(code, frequency, None, None, labels, [1.0, 2.0])
+        clock.now += 365 * 24 * 3600
+
+        requested = bcrp_api(mock_httpx, lambda codes, start, end: {"periods": []})
+        client = AsyncBCRPClient(rate_limit=0, cache=cache)
+        df = await client.get_series([code])
+        await client.aclose()
+
+        assert len(requested) == 1
+        assert requested[0].startswith(f"/estadisticas/series/api/{code}/json/{tail_start}/")
+        assert df["time"].tolist() == labels
+
+    @pytest.mark.asyncio
+    async def test_stale_entry_with_unparsable_last_label_is_refetched(self, tmp_path, mock_httpx):
+        from mcp_bcrp.cache import SeriesCache
+
+        clock = FakeClock()
+        cache = SeriesCache(tmp_path, clock=clock)
+        cache.put("PN38063GQ", "quarterly", None, None, ["T4.23", "T5.24"], [1.0, 2.0])
+        clock.now += 365 * 24 * 3600
+
+        requested = bcrp_api(mock_httpx, lambda codes, start, end: {"periods": [
+            {"name": "T4.23", "values": ["1.5"]},
+        ]})
+        client = AsyncBCRPClient(rate_limit=0, cache=cache)
+        df = await client.get_series(["PN38063GQ"])
+        await client.aclose()
+
+        assert requested == ["/estadisticas/series/api/PN38063GQ/json"]
+        assert df["PN38063GQ"].tolist() == [1.5]
+
+    @pytest.mark.asyncio
+    async def test_failed_tail_refresh_serves_stale_entry(self, tmp_path, mock_httpx):
+        import httpx
+        from mcp_bcrp.cache import SeriesCache
+
+        clock = FakeClock()
+        cache = SeriesCache(tmp_path, clock=clock)
+        cache.put("PN01270PM", "monthly", "2024-1", "2024-3", ["Ene.2024", "Feb.2024"], [1.0, 2.0])
+        clock.now += 2 * 24 * 3600
+
+        mock_httpx(lambda request: httpx.Response(503))
+        client = AsyncBCRPClient(rate_limit=0, cache=cache)
+        df = await client.get_series(["PN01270PM"], "2024-01", "2024-03")
+        await client.aclose()
+
+        assert df["time"].tolist() == ["Ene.2024", "Feb.2024"]
+        assert df["PN01270PM"].tolist() == [1.0, 2.0]
+
+    def test_merge_restores_chronological_order(self):
+        from mcp_bcrp.client import _merge_on_time
+
+        a = pd.DataFrame({"time": ["Nov.2023", "Dic.2023", "Ene.2024"], "A": [1.0, 2.0, 3.0]})
+        b = pd.DataFrame({"time": ["Oct.2023", "Nov.2023", "Dic.2023"], "B": [4.0, 5.0, 6.0]})
+
+        merged = _merge_on_time([a, b])
+
+        assert merged["time"].tolist() == ["Oct.2023", "Nov.2023", "Dic.2023", "Ene.2024"]
+        assert merged["A"].tolist()[1:] == [1.0, 2.0, 3.0]
+        assert merged["B"].tolist()[:3] == [4.0, 5.0, 6.0]
+
+    def test_entries_expire_per_frequency(self, tmp_path):
+        from mcp_bcrp.cache import SeriesCache
+
+        clock = FakeClock()
+        cache = SeriesCache(tmp_path, clock=clock)
+        cache.put("PD04638PD", "daily", None, None, ["02.Ene.24"], [3.7])
+        cache.put("PN01713AM", "annual", None, None, ["2024"], [1.5])
+
+        clock.now += 7 * 3600
+        assert cache.get("PD04638PD", "daily", None, None) is None
+        assert cache.get("PN01713AM", "annual", None, None)["values"] == [1.5]
+        assert cache.load("PD04638PD", "daily", None, None)["time"] == ["02.Ene.24"]
+
+
+def daily_label(api_date):
+    """'2024-1-5' -> '05.Ene.24'"""
+    months = ["Ene", "Feb", "Mar", "Abr", "May", "Jun",
+              "Jul", "Ago", "Sep", "Oct", "Nov", "Dic"]
+    y, m, d = (int(p) for p in api_date.split("-"))
+    return f"{d:02d}.{months[m - 1]}.{y % 100:02d}"
+
+
+class TestRangeChunking:
+    """Long daily ranges are fetched as yearly windows and stitched back."""
+
+    @pytest.mark.asyncio
+    async def test_long_daily_range_is_split_and_stitched(self, mock_httpx):
+        def responder(codes, start, end):
+            labels = [daily_label(start), daily_label(end)]
+            if start.endswith("-1-1"):
+                # Overlap with the previous window's last day.
+                labels.insert(0, daily_label(f"{int(start[:4]) - 1}-12-31"))
+            return {"periods": [{"name": t, "values": ["1.0"]} for t in labels]}
+
+        requested = bcrp_api(mock_httpx, responder)
+        client = AsyncBCRPClient(rate_limit=0, cache=False)
+        df = await client.get_series(["PD04638PD"], "2022-06-01", "2024-02-10")
+        await client.aclose()
+
+        assert sorted(p.split("/json/")[1] for p in requested) == [
+            "2022-6-1/2022-12-31", "2023-1-1/2023-12-31", "2024-1-1/2024-2-10",
+        ]
+        assert df["time"].tolist() == [
+            "01.Jun.22", "31.Dic.22", "01.Ene.23", "31.Dic.23", "01.Ene.24", "10.Feb.24",
+        ]
+
+    def test_short_or_open_ranges_are_not_split(self):
+        client = AsyncBCRPClient(cache=False)
+
+        assert client._split_range("2024-1-1", "2024-12-31", "daily") == [("2024-1-1", "2024-12-31")]
+        assert client._split_range(None, None, "daily") == [(None, None)]
+        assert client._split_range("1990-1", "2024-12", "monthly") == [("1990-1", "2024-12")]
+
+
+class TestMixedFrequencies:
+    """Codes are grouped by suffix frequency, one request per group."""
+
+    @staticmethod
+    def responder(codes, start, end):
+        if codes == ["PD04638PD"]:
+            labels = ["01.Feb.24", "02.Feb.24"]
+        else:
+            labels = ["Ene.2024", "Feb.2024"]
+        return {"periods": [
+            {"name": t, "values": [str(i + 1) for i in range(len(codes))]} for t in labels
+        ]}
+
+    @pytest.mark.asyncio
+    async def test_one_request_per_frequency_with_matching_date_format(self, mock_httpx):
+        requested = bcrp_api(mock_httpx, self.responder)
+        client = AsyncBCRPClient(rate_limit=0, cache=False)
+
+        frames = await client.get_series(
+            ["PN01270PM", "PD04638PD", "PN01271PM"], "2024-01", "2024-02", by_frequency=True
+        )
+        await client.aclose()
+
+        assert sorted(requested) == [
+            "/estadisticas/series/api/PD04638PD/json/2024-1-1/2024-2-29",
+            "/estadisticas/series/api/PN01270PM-PN01271PM/json/2024-1/2024-2",
+        ]
+        assert set(frames) == {"daily", "monthly"}
+        assert list(frames["monthly"].columns) == ["time", "PN01270PM", "PN01271PM"]
+
+    @pytest.mark.asyncio
+    async def test_mixed_frequencies_are_aligned_on_period_start(self, mock_httpx):
+        bcrp_api(mock_httpx, self.responder)
+        client = AsyncBCRPClient(rate_limit=0, cache=False)
+
+        df = await client.get_series(["PN01270PM", "PD04638PD"], "2024-01", "2024-02")
+        await client.aclose()
+
+        assert list(df.columns) == ["time", "PN01270PM", "PD04638PD"]
+        assert df["time"].tolist() == ["Ene.2024", "01.Feb.24", "02.Feb.24"]
+        assert df["PN01270PM"].tolist()[:2] == [1.0, 1.0]
+        assert pd.isna(df["PN01270PM"].iloc[2])
+        assert df["PD04638PD"].tolist()[1:] == [1.0, 1.0]
+
+    @pytest.mark.asyncio
+    async def test_period_index_mode(self, mock_httpx):
+        """as_period_index yields float64 frames indexed by typed periods."""
+        bcrp_api(mock_httpx, self.responder)
+        client = AsyncBCRPClient(rate_limit=0, cache=False)
+
+        monthly = await client.get_series(["PN01270PM"], "2024-01", "2024-02", as_period_index=True)
+        mixed = await client.get_series(
+            ["PN01270PM", "PD04638PD"], "2024-01", "2024-02", as_period_index=True
+        )
+        frames = await client.get_series(
+            ["PN01270PM", "PD04638PD"], "2024-01", "2024-02",
+            by_frequency=True, as_period_index=True,
+        )
+        await client.aclose()
+
+        assert monthly.index.equals(pd.PeriodIndex(["2024-01", "2024-02"], freq="M", name="time"))
+        assert list(monthly.columns) == ["PN01270PM"]
+        assert (monthly.dtypes == "float64").all()
+        assert mixed.index.equals(pd.PeriodIndex(
+            ["2024-01-01", "2024-02-01", "2024-02-02"], freq="D", name="time"
+        ))
+        assert list(mixed.columns) == ["PN01270PM", "PD04638PD"]
+        assert frames["daily"].index.freqstr == "D"
+        assert frames["monthly"].index.freqstr == "M"
+
+
+class TestPeriodLabels:
+    """Vectorized parsing of BCRP Spanish period labels."""
+
+    LABELS = [
+        "02.Ene.24", "31.Dic.68", "Ene.2024", "Dic.70", "T1.24", "T4.1999",
+        "2024", "Xyz.2024", "n.d.", "",
+    ]
+
+    def test_parses_every_label_shape(self):
+        from mcp_bcrp.client import parse_period_labels
+
+        dates = parse_period_labels(self.LABELS)
+
+        assert isinstance(dates, pd.DatetimeIndex)
+        assert dates.strftime("%Y-%m-%d").tolist()[:7] == [
+            "2024-01-02", "2068-12-31", "2024-01-01", "1970-12-01",
+            "2024-01-01", "1999-10-01", "2024-01-01",
+        ]
+        assert dates[7:].isna().all()
+
+    @pytest.mark.parametrize("label", ["T5.24", "T0.24", "32.Ene.24", "Ene"])
+    def test_invalid_labels_are_nat(self, label):
+        from mcp_bcrp.client import parse_period_labels
+
+        assert parse_period_labels([label])[0] is pd.NaT
+
+    @pytest.mark.parametrize("labels, freq", [
+        (["31.Dic.23", "01.Ene.24"], "D"),
+        (["Dic.2023", "Ene.2024"], "M"),
+        (["T4.23", "T1.24"], "Q"),
+        (["2023", "2024"], "Y"),
+    ])
+    def test_period_index_at_label_frequency(self, labels, freq):
+        from mcp_bcrp.client import parse_period_labels
+
+        periods = parse_period_labels(labels, as_period=True)
+
+        assert isinstance(periods, pd.PeriodIndex)
+        assert periods.freqstr.startswith(freq)
+        assert (periods[1] - periods[0]).n == 1
+
+    def test_period_index_rejects_mixed_frequencies(self):
+        from mcp_bcrp.client import parse_period_labels
+
+        with pytest.raises(ValueError):
+            parse_period_labels(["Ene.2024", "T1.24"], as_period=True)
+
+
+class TestCodeBatching:
+    """Long code lists are split into several requests and merged back."""
+
+    @pytest.mark.asyncio
+    async def test_no_codes_returns_empty_result(self, mock_httpx):
+        requested = bcrp_api(mock_httpx, monthly_payload)
+        client = AsyncBCRPClient(rate_limit=0, cache=False)
+
+        df = await client.get_series([], "2024-01", "2024-03")
+        frames = await client.get_series([], by_frequency=True)
+        await client.aclose()
+
+        assert df.empty
+        assert frames == {}
+        assert requested == []
+
+    @pytest.mark.asyncio
+    async def test_codes_are_batched_and_merged_in_caller_order(self, mock_httpx):
+        requested = bcrp_api(mock_httpx, monthly_payload)
+        client = AsyncBCRPClient(rate_limit=0, cache=False, max_codes_per_request=2)
+        codes = ["PN00005MM", "PN00001MM", "PN00004MM", "PN00002MM", "PN00003MM"]
+
+        df = await client.get_series(codes, "2024-01", "2024-03")
+        await client.aclose()
+
+        assert sorted(p.split("/api/")[1].split("/")[0] for p in requested) == [
+            "PN00003MM", "PN00004MM-PN00002MM", "PN00005MM-PN00001MM",
+        ]
+        assert list(df.columns) == ["time"] + codes
+        assert df["time"].tolist() == ["Ene.2024", "Feb.2024", "Mar.2024"]
+        # Values follow each code's position within its own batch.
+        assert df["PN00001MM"].tolist() == [2.0, 3.0, 4.0]
+        assert df["PN00003MM"].tolist() == [1.0, 2.0, 3.0]
+
+    def test_max_codes_per_request_from_environment(self, monkeypatch):
+        monkeypatch.setenv("BCRP_MAX_CODES_PER_REQUEST", "25")
+        assert AsyncBCRPClient(cache=False).max_codes_per_request == 25
+
+
+class TestFastJson:
+    """Every available JSON backend must behave like the standard library."""
+
+    PAYLOAD = {
+        "periods": [{"name": "Ene.2024", "values": ["3.5", "n.d."]}],
+        "nombre": "Índice de precios",
+        "n": 3, "x": 2.5, "ok": True, "none": None,
+    }
+
+    @pytest.mark.parametrize("backend", sorted(fast_json.BACKENDS))
+    def test_backend_round_trip(self, backend):
+        loads, dumps = fast_json.BACKENDS[backend]
+        text = json.dumps(self.PAYLOAD, ensure_ascii=False)
+
+        assert loads(text) == self.PAYLOAD
+        assert loads(text.encode("utf-8")) == self.PAYLOAD
+        assert json.loads(dumps(self.PAYLOAD)) == self.PAYLOAD
+        assert "Índice" in dumps(self.PAYLOAD)
+        assert dumps({"a": 1}, indent=True) == '{\n  "a": 1\n}'
+        with pytest.raises(ValueError):
+            loads(b"{not json")
+
+
 class TestAsyncBCRPClient:
     """Test async API client."""
     
@@ -108,7 +1307,127 @@ class TestAsyncBCRPClient:
 
         assert client.timeout == 7.5
 
+    def test_rate_limit_from_environment(self, monkeypatch):
+        monkeypatch.setenv("BCRP_RATE_LIMIT", "5")
+        monkeypatch.setenv("BCRP_RATE_BURST", "3")
+        monkeypatch.setenv("BCRP_MAX_CONCURRENCY", "not-a-number")
+        client = AsyncBCRPClient()
+
+        assert client.rate_limiter.rate == 5.0
+        assert client.rate_limiter.burst == 3
+        assert client.semaphore._value == 4  # invalid value -> default
+
+    @pytest.mark.asyncio
+    async def test_max_concurrency_bounds_requests_in_flight(self, mock_httpx):
+        import asyncio
+        import httpx
+
+        in_flight = 0
+        peak = 0
+
+        async def handler(request):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return httpx.Response(200, json={})
+
+        mock_httpx(handler)
+
+        async with AsyncBCRPClient(rate_limit=0, max_concurrency=2) as client:
+            await asyncio.gather(*(client._fetch(f"https://example.test/{i}") for i in range(6)))
+
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_requests_share_one_pooled_http_client(self, mock_httpx):
+        """Consecutive fetches reuse a single httpx.AsyncClient until aclose()."""
+        import httpx
+
+        created = mock_httpx(lambda request: httpx.Response(200, json={}))
+
+        async with AsyncBCRPClient(max_connections=4, keepalive_expiry=5.0) as client:
+            await client._fetch("https://example.test/a")
+            await client._fetch("https://example.test/b")
+            assert len(created) == 1
+            assert client.limits.max_connections == 4
+
+        assert created[0].is_closed
+        assert client._client is None
+
+    def test_columnar_parser_matches_rowwise_parsing(self):
+        """_parse_periods must equal the original per-period dict loop."""
+        from mcp_bcrp.client import _parse_periods
+
+        periods = [
+            {"name": "Ene.2024", "values": ["3.5", "n.d.", 7]},
+            {"name": "Feb.2024", "values": ["No Informado", "2.25", "1e3"]},
+            {"name": "Mar.2024", "values": ["4", "nan", None]},
+            {"name": "Abr.2024", "values": ["-1.5", "0"]},  # ragged row
+            {"name": "May.2024", "values": ["1", "2", "3", "4"]},  # extra value
+        ]
+        codes = ["A", "B", "C"]
+
+        records = []
+        for p in periods:
+            row = {"time": p["name"]}
+            for i, val in enumerate(p["values"]):
+                col_name = codes[i] if i < len(codes) else f"series_{i}"
+                try:
+                    if isinstance(val, str) and "nir" in val.lower():
+                        row[col_name] = None
+                    elif val == "n.d.":
+                        row[col_name] = None
+                    else:
+                        row[col_name] = float(val)
+                except (ValueError, TypeError):
+                    row[col_name] = None
+            records.append(row)
+        expected = pd.DataFrame(records).astype({c: float for c in codes + ["series_3"]})
+
+        result = _parse_periods(periods, codes)
+
+        pd.testing.assert_frame_equal(result, expected, check_column_type=False)
+        assert (result.dtypes.iloc[1:] == "float64").all()
+
     def test_package_version_is_generated(self):
         """The package exposes a version (generated when a distribution is built)."""
         assert isinstance(mcp_bcrp.__version__, str)
         assert mcp_bcrp.__version__
+
+
+class TestColdStart:
+    """The server entry point must not pay for the data stack at import."""
+
+    # Self time of mcp_bcrp's own modules; the rest is fastmcp/httpx.
+    IMPORT_BUDGET_US = 200_000
+
+    def test_server_import_defers_heavy_dependencies(self, tmp_path):
+        import os
+        import subprocess
+        import sys
+
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "import mcp_bcrp.server"],
+            capture_output=True, text=True, check=True,
+            env={**os.environ, "BCRP_CACHE_DIR": str(tmp_path)},
+        )
+        times = {}
+        for line in result.stderr.splitlines():
+            if line.startswith("import time:") and line.split("|")[0][12:].strip().isdigit():
+                self_us, _, name = line[12:].split("|")
+                times[name.strip()] = int(self_us)
+
+        assert "mcp_bcrp.server" in times
+        assert not {"pandas", "numpy", "rapidfuzz", "matplotlib"} & times.keys()
+        own = sum(us for name, us in times.items() if name.startswith("mcp_bcrp"))
+        assert own < self.IMPORT_BUDGET_US
+
+    def test_package_attributes_are_lazy(self):
+        import mcp_bcrp.client
+
+        assert mcp_bcrp.BCRPMetadata is mcp_bcrp.client.BCRPMetadata
+        assert mcp_bcrp.parse_period_labels is mcp_bcrp.client.parse_period_labels
+        with pytest.raises(AttributeError):
+            mcp_bcrp.missing